@@ -0,0 +1,195 @@
+"""Benchmarks of the financial and simulation hot paths.
+
+Run every benchmark at its default sizes and write the results to a JSON file::
+
+    python -m benchmarks.run --output benchmarks/baseline.json
+
+Compare a new run against a saved baseline, exiting with status 1 when any benchmark's median
+time grew by more than the threshold::
+
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.2
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src import accounts, utils
+
+THIS_YEAR = 2021
+
+
+def _calculate_tax(size: int, directory: str) -> Callable[[], Any]:
+    incomes = np.random.default_rng(0).uniform(0, 300_000, size).tolist()
+    return lambda: [utils.calculate_tax(income) for income in incomes]
+
+
+def _calculate_tax_array(size: int, directory: str) -> Callable[[], Any]:
+    incomes = np.random.default_rng(0).uniform(0, 300_000, size)
+    return lambda: utils.calculate_tax_array(incomes)
+
+
+def _get_number_of_weekdays(size: int, directory: str) -> Callable[[], Any]:
+    starts = pd.date_range("2000-01-01", periods=size, freq="D").strftime("%Y-%m-%d").tolist()
+    ends = pd.date_range("2001-06-30", periods=size, freq="D").strftime("%Y-%m-%d").tolist()
+    return lambda: [utils.get_number_of_weekdays(s, e) for s, e in zip(starts, ends)]
+
+
+def _create_all_x_income_dicts(size: int, directory: str) -> Callable[[], Any]:
+    rates = np.linspace(20, 200, size).tolist()
+    return lambda: [utils.create_all_x_income_dicts(rate, 8, 6, THIS_YEAR) for rate in rates]
+
+
+def _compare_rates_to_base_rate(size: int, directory: str) -> Callable[[], Any]:
+    rates = np.linspace(20, 200, size)
+    return lambda: utils.compare_rates_to_base_rate(30, "weeks", rates, 8, 6, THIS_YEAR)
+
+
+def _generate_n_days_events_for_accounts(size: int, directory: str) -> Callable[[], Any]:
+    population = accounts.generate_accounts(size, seed=0)
+    return lambda: accounts.generate_n_days_events_for_accounts(population, 30, seed=0)
+
+
+def _paid_accounts(size: int) -> list:
+    # Account.get_info needs paid hours, which a working week gives every account
+    return accounts.generate_n_days_events_for_accounts(
+        accounts.generate_accounts(size, seed=0), 5, seed=0
+    )
+
+
+def _account_save(size: int, directory: str) -> Callable[[], Any]:
+    population = _paid_accounts(size)
+
+    def save() -> None:
+        for account in population:
+            account.save()
+
+    return save
+
+
+def _create_accounts_from_data_path(size: int, directory: str) -> Callable[[], Any]:
+    for account in _paid_accounts(size):
+        account.save()
+
+    return lambda: accounts.create_accounts_from_data_path("data")
+
+
+# Name -> (setup returning the timed callable, default sizes)
+BENCHMARKS: dict = {
+    "calculate_tax": (_calculate_tax, (1_000, 100_000)),
+    "calculate_tax_array": (_calculate_tax_array, (1_000, 1_000_000)),
+    "get_number_of_weekdays": (_get_number_of_weekdays, (100, 10_000)),
+    "create_all_x_income_dicts": (_create_all_x_income_dicts, (100, 10_000)),
+    "compare_rates_to_base_rate": (_compare_rates_to_base_rate, (1_000, 100_000)),
+    "generate_n_days_events_for_accounts": (
+        _generate_n_days_events_for_accounts,
+        (100, 10_000, 100_000),
+    ),
+    "Account.save": (_account_save, (100, 2_000)),
+    "create_accounts_from_data_path": (_create_accounts_from_data_path, (100, 2_000)),
+}
+
+
+def time_benchmark(name: str, size: int, repeats: int = 5) -> dict:
+    """Median and minimum wall time of repeats calls, each in a fresh working directory"""
+
+    setup, _ = BENCHMARKS[name]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            function = setup(size, directory)
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                function()
+                times.append(time.perf_counter() - start)
+        finally:
+            os.chdir(cwd)
+
+    return {"median": statistics.median(times), "min": min(times), "repeats": repeats}
+
+
+def run(names: list, sizes: Optional[list] = None, repeats: int = 5) -> dict:
+    results: dict = {}
+    for name in names:
+        for size in sizes or BENCHMARKS[name][1]:
+            results.setdefault(name, {})[str(size)] = result = time_benchmark(name, size, repeats)
+            print(f"{name:40} {size:>10} {result['median'] * 1000:12.3f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "created": datetime.datetime.now().astimezone().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2) -> list:
+    """Benchmarks whose median time grew by more than threshold (a fraction) over the baseline"""
+
+    regressions = []
+    for name, sizes in current["results"].items():
+        for size, result in sizes.items():
+            before = baseline["results"].get(name, {}).get(size)
+            if before is None:
+                continue
+
+            ratio = result["median"] / before["median"]
+            if ratio > 1 + threshold:
+                regressions.append({"name": name, "size": int(size), "ratio": ratio})
+
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="benchmarks to run, all by default")
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {unknown}, choose from {list(BENCHMARKS)}")
+
+    current = run(args.names or list(BENCHMARKS), args.sizes, args.repeats)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare) as f:
+        regressions = compare(json.load(f), current, args.threshold)
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['name']} at {regression['size']}: "
+            f"{regression['ratio']:.2f}x the baseline",
+            file=sys.stderr,
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
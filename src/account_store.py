@@ -0,0 +1,466 @@
+import os
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from src.accounts import (
+    Account,
+    generate_account_columns,
+    iter_account_batches_from_data_path,
+)
+from src.instrumentation import add_bytes, instrumented, is_enabled
+from src.rate_history import RateHistory, format_epoch_us, to_epoch_us
+
+if TYPE_CHECKING:
+    from src.journal import Journal
+
+FLOAT_COLUMNS = (
+    "rate",
+    "unpaid_hours",
+    "unpaid_income",
+    "paid_hours",
+    "paid_income",
+    "average_pay_rate",
+)
+
+# Columns with a running total, kept in this order followed by the number of rated accounts
+TOTAL_COLUMNS = FLOAT_COLUMNS[:-1]
+
+
+def _pay_raise_list(times: np.ndarray, rates: np.ndarray) -> list:
+    return [
+        [None if rate != rate else rate, format_epoch_us(time)]
+        for rate, time in zip(rates.tolist(), times.tolist())
+    ]
+
+
+class AccountStore:
+    """Columnar (struct-of-arrays) storage for a population of accounts.
+
+    Every attribute of ``Account`` lives in one contiguous NumPy column and the bulk methods
+    mirror ``Account``'s methods over an index mask, an array of row numbers or a slice
+    (``None`` selects every account). A missing rate is stored as NaN. With ``copy=False``
+    float64 arrays passed in are used as the columns directly. Once a ``Journal`` is attached
+    every ``add_hours``, ``pay`` and ``update_rate`` is also recorded to it. Population totals
+    are moved by the change each operation writes, so ``aggregates`` never scans the store.
+    """
+
+    def __init__(
+        self,
+        ids: Any,
+        first_names: Any,
+        last_names: Any,
+        rates: Any,
+        unpaid_hours: Any = None,
+        unpaid_income: Any = None,
+        paid_hours: Any = None,
+        paid_income: Any = None,
+        average_pay_rate: Any = None,
+        copy: bool = True,
+    ):
+        self.id = np.asarray(ids, dtype=np.int64)
+        n = len(self.id)
+        self.first_name = np.asarray(first_names, dtype=str).reshape(n)
+        self.last_name = np.asarray(last_names, dtype=str).reshape(n)
+
+        def column(values: Any) -> np.ndarray:
+            values = np.zeros(n) if values is None else values
+            values = np.array(values, np.float64) if copy else np.asarray(values, np.float64)
+            return values.reshape(n)
+
+        # None rates become NaN
+        self.rate: np.ndarray = column(rates)
+        self.unpaid_hours: np.ndarray = column(unpaid_hours)
+        self.unpaid_income: np.ndarray = column(unpaid_income)
+        self.paid_hours: np.ndarray = column(paid_hours)
+        self.paid_income: np.ndarray = column(paid_income)
+        self.average_pay_rate: np.ndarray = column(average_pay_rate)
+
+        # Raise history, one entry per rate an account has had
+        self.rate_history = RateHistory(n)
+        self.rate_history.append(np.arange(n), self.rate)
+        self.journal: Optional["Journal"] = None
+        self.recompute()
+
+    @classmethod
+    def from_accounts(cls, accounts: Iterable[Account]) -> "AccountStore":
+        accounts = list(accounts)
+        columns: dict = {
+            column: [getattr(account, column) for account in accounts]
+            for column in FLOAT_COLUMNS[1:]
+        }
+        store = cls(
+            [account.id for account in accounts],
+            [account.first_name for account in accounts],
+            [account.last_name for account in accounts],
+            [account.rate for account in accounts],
+            **columns,
+        )
+
+        raises = [(row, *pay_raise) for row, a in enumerate(accounts) for pay_raise in a.pay_raise]
+        rows, rates, times = zip(*raises) if raises else ([], [], [])
+        store.rate_history = RateHistory.from_arrays(
+            rows, to_epoch_us(list(times)), np.asarray(rates, dtype=np.float64)
+        )
+
+        return store
+
+    @classmethod
+    def concat(cls, stores: Iterable["AccountStore"]) -> "AccountStore":
+        stores = list(stores)
+        if not stores:
+            return cls([], [], [], [])
+
+        if len(stores) == 1:
+            return stores[0]
+
+        columns: dict = {
+            column: np.concatenate([getattr(store, column) for store in stores])
+            for column in FLOAT_COLUMNS[1:]
+        }
+        store = cls(
+            np.concatenate([store.id for store in stores]),
+            np.concatenate([store.first_name for store in stores]),
+            np.concatenate([store.last_name for store in stores]),
+            np.concatenate([store.rate for store in stores]),
+            **columns,
+        )
+
+        store.rate_history = RateHistory(sum(len(part.rate_history) for part in stores))
+        offset = 0
+        for part in stores:
+            store.rate_history.extend(part.rate_history, row_offset=offset)
+            offset += len(part)
+
+        return store
+
+    @classmethod
+    def generate(
+        cls, n: int, seed: Optional[int] = None, batch_size: int = 1_000_000
+    ) -> "AccountStore":
+        """Fill a store with n synthetic accounts without creating Account objects"""
+
+        rng = np.random.default_rng(seed)
+        return cls.concat(
+            cls(**generate_account_columns(min(batch_size, n - start), rng))
+            for start in range(0, n, batch_size)
+        )
+
+    @classmethod
+    def from_data_path(cls, path: str, **kwargs: Any) -> "AccountStore":
+        """Load a directory of account JSON files batch by batch into one store"""
+
+        return cls.concat(
+            cls.from_accounts(batch)
+            for batch in iter_account_batches_from_data_path(path, **kwargs)
+        )
+
+    @classmethod
+    @instrumented
+    def load(cls, path: str) -> "AccountStore":
+        """Load a population written by ``save``"""
+
+        with np.load(path, allow_pickle=False) as data:
+            store = cls(
+                data["id"],
+                data["first_name"],
+                data["last_name"],
+                data["rate"],
+                **{column: data[column] for column in FLOAT_COLUMNS[1:]},
+            )
+            store.rate_history = RateHistory.from_arrays(
+                data["raise_rows"], data["raise_times"], data["raise_rates"]
+            )
+
+        return store
+
+    @instrumented
+    def save(self, path: str = "data/accounts.npz") -> None:
+        """Write the whole population, including raise history, to a single .npz file"""
+
+        # np.savez appends the suffix itself, the path is normalised to the file it writes
+        if not path.endswith(".npz"):
+            path += ".npz"
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        np.savez(
+            path,
+            id=self.id,
+            first_name=self.first_name,
+            last_name=self.last_name,
+            **{column: getattr(self, column) for column in FLOAT_COLUMNS},
+            raise_rows=self.rate_history.rows,
+            raise_times=self.rate_history.times,
+            raise_rates=self.rate_history.rates,
+        )
+        if is_enabled():
+            add_bytes("AccountStore.save", os.path.getsize(path))
+
+    def __repr__(self) -> str:
+        return f"AccountStore({len(self)} accounts)"
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __getitem__(self, row: int) -> "AccountView":
+        return self.account(row)
+
+    def __iter__(self) -> Iterator["AccountView"]:
+        return (AccountView(self, row) for row in range(len(self)))
+
+    def account(self, row: int) -> "AccountView":
+        if not -len(self) <= row < len(self):
+            raise IndexError("Account row out of range")
+
+        return AccountView(self, row % len(self))
+
+    def _info(self, row: int) -> dict:
+        info = {"id": self.id[row].item()}
+        info["first_name"] = self.first_name[row].item()
+        info["last_name"] = self.last_name[row].item()
+        info.update({column: getattr(self, column)[row].item() for column in FLOAT_COLUMNS})
+        info["rate"] = None if np.isnan(self.rate[row]) else info["rate"]
+
+        return info
+
+    def get_info(self, row: int) -> dict:
+        return {**self._info(row), "pay_raise": self.pay_raise(row)}
+
+    def to_accounts(self) -> list:
+        # The history is split by row once rather than searched for every row
+        times, rates = self.rate_history.split(len(self))
+        return [
+            Account(**self._info(row), pay_raise=_pay_raise_list(times[row], rates[row]))
+            for row in range(len(self))
+        ]
+
+    def _rows(self, index: Any) -> Any:
+        if index is None:
+            return slice(None)
+
+        return index if isinstance(index, slice) else np.asarray(index)
+
+    def _rate(self, rows: Any) -> np.ndarray:
+        rate = self.rate[rows]
+        if np.isnan(rate).any():
+            raise ValueError("Rate is not set")
+
+        return rate
+
+    def _written(self, rows: Any) -> Any:
+        # Positions whose value is kept by a write to rows, the last of each repeated row
+        if not isinstance(rows, np.ndarray) or rows.dtype == bool or rows.size < 2:
+            return ...
+
+        _, last = np.unique(rows[::-1], return_index=True)
+        return ... if len(last) == len(rows) else np.sort(len(rows) - 1 - last)
+
+    def _assign(self, column: str, rows: Any, values: Any, add: bool = False) -> np.ndarray:
+        """Write (or add) values to the rows of a column and move its total by the change"""
+
+        array = getattr(self, column)
+        old = array[rows]
+        new = old + values if add else np.broadcast_to(np.asarray(values, np.float64), old.shape)
+
+        # Before the write, a slice of rows makes old a view of the column
+        if column in TOTAL_COLUMNS:
+            written = self._written(rows)
+            before, after = (old, new) if written is ... else (old[written], new[written])
+            if column == "rate":
+                rated = np.count_nonzero(~np.isnan(after)) - np.count_nonzero(~np.isnan(before))
+                self._totals[0] += np.nansum(after) - np.nansum(before)
+                self._totals[-1] += rated
+            else:
+                self._totals[TOTAL_COLUMNS.index(column)] += after.sum() - before.sum()
+
+        array[rows] = new
+        return new
+
+    def recompute(self) -> None:
+        """Rebuild the totals from the columns, after writing to them directly"""
+
+        rated = ~np.isnan(self.rate)
+        self._totals = np.array(
+            [self.rate[rated].sum()]
+            + [getattr(self, column).sum() for column in TOTAL_COLUMNS[1:]]
+            + [np.count_nonzero(rated)],
+            np.float64,
+        )
+
+    def aggregates(self) -> dict:
+        """Population-wide totals and averages, without scanning the accounts"""
+
+        total_rate, unpaid_hours, unpaid_income, paid_hours, paid_income, rated = self._totals
+        return {
+            "accounts": len(self),
+            "rated_accounts": int(rated),
+            "total_unpaid_hours": unpaid_hours,
+            "total_unpaid_income": unpaid_income,
+            "total_paid_hours": paid_hours,
+            "total_paid_income": paid_income,
+            "average_rate": total_rate / rated if rated else None,
+            "average_pay_rate": paid_income / paid_hours if paid_hours else None,
+        }
+
+    def _row_numbers(self, rows: Any) -> np.ndarray:
+        if isinstance(rows, slice):
+            return np.arange(len(self))[rows]
+
+        if rows.dtype == bool:
+            return np.flatnonzero(rows)
+
+        return np.ravel(rows).astype(np.int64) % len(self)
+
+    def _record(self, kind: str, rows: Any, values: Any) -> None:
+        if self.journal is None:
+            return
+
+        # One record per row as written, a repeated row keeps only its last value
+        numbers = self._row_numbers(rows)
+        values = np.broadcast_to(values, numbers.shape)
+        written = self._written(rows)
+        if written is not ...:
+            numbers, values = numbers[written], values[written]
+
+        self.journal.record(kind, numbers, values)
+
+    def pay_raise(self, row: int) -> list:
+        """Raise history of one row in Account.pay_raise's [rate, time] format"""
+
+        return _pay_raise_list(*self.rate_history.for_row(row))
+
+    def rate_at(self, rows: Any, times: Any) -> np.ndarray:
+        """Rate of each row at each time (datetimes, ISO strings or epoch microseconds)"""
+
+        return self.rate_history.rate_at(rows, times)
+
+    def update_rate(self, rates: Any, index: Any = None) -> dict:
+        rows = self._rows(index)
+        self._assign("rate", rows, rates)
+        rates = self.rate[rows]
+        self.rate_history.append(self._row_numbers(rows), rates)
+        self._record("update_rate", rows, rates)
+
+        return {"rate": rates}
+
+    def average_rate(self, index: Any = None) -> dict:
+        rows = self._rows(index)
+        self._rate(rows)
+
+        paid_hours = self.paid_hours[rows]
+        if (paid_hours == 0).any():
+            raise ValueError("No paid hours")
+
+        self.average_pay_rate[rows] = self.paid_income[rows] / paid_hours
+
+        return {"average_rate": self.average_pay_rate[rows]}
+
+    def add_hours(self, hours: Any, index: Any = None) -> dict:
+        rows = self._rows(index)
+        rate = self._rate(rows)
+
+        unpaid_hours = self._assign("unpaid_hours", rows, hours, add=True)
+        self._assign("unpaid_income", rows, unpaid_hours * rate)
+        self._record("add_hours", rows, hours)
+        return {"unpaid_hours": self.unpaid_hours[rows], "paid_hours": self.paid_hours[rows]}
+
+    def get_income(self, index: Any = None) -> dict:
+        rows = self._rows(index)
+        rate = self._rate(rows)
+
+        self._assign("unpaid_income", rows, self.unpaid_hours[rows] * rate)
+
+        # Replayed as adding no hours, which recomputes the unpaid income the same way
+        self._record("add_hours", rows, 0.0)
+        return {"unpaid_income": self.unpaid_income[rows], "paid_income": self.paid_income[rows]}
+
+    def pay(self, hours: Any = 0, index: Any = None) -> dict:
+        rows = self._rows(index)
+        rate = self._rate(rows)
+
+        unpaid_hours = self.unpaid_hours[rows]
+        hours = np.where(np.asarray(hours) > 0, hours, unpaid_hours)
+        self._assign("paid_hours", rows, hours, add=True)
+        unpaid_hours = self._assign("unpaid_hours", rows, unpaid_hours - hours)
+
+        self._assign("paid_income", rows, hours * rate, add=True)
+        self._assign("unpaid_income", rows, unpaid_hours * rate)
+        self._record("pay", rows, hours)
+
+        return {
+            "unpaid_hours": self.unpaid_hours[rows],
+            "paid_hours": self.paid_hours[rows],
+            "unpaid_income": self.unpaid_income[rows],
+            "paid_income": self.paid_income[rows],
+        }
+
+
+def _column_property(column: str) -> property:
+    def getter(view: "AccountView") -> Any:
+        value = getattr(view.store, column)[view.row].item()
+        return None if column == "rate" and value != value else value
+
+    def setter(view: "AccountView", value: Any) -> None:
+        if column in FLOAT_COLUMNS:
+            view.store._assign(column, view.row, np.nan if value is None else value)
+            return
+
+        # Name columns are fixed-width strings, widened rather than truncating a longer name
+        array = getattr(view.store, column)
+        if array.dtype.kind == "U" and len(value) > array.dtype.itemsize // 4:
+            array = array.astype(f"<U{len(value)}")
+            setattr(view.store, column, array)
+
+        array[view.row] = value
+
+    return property(getter, setter)
+
+
+class AccountView(Account):
+    """Object API over one row of an ``AccountStore``, mutations go through the store"""
+
+    id = _column_property("id")
+    first_name = _column_property("first_name")
+    last_name = _column_property("last_name")
+    rate = _column_property("rate")
+    unpaid_hours = _column_property("unpaid_hours")
+    unpaid_income = _column_property("unpaid_income")
+    paid_hours = _column_property("paid_hours")
+    paid_income = _column_property("paid_income")
+    average_pay_rate = _column_property("average_pay_rate")
+
+    def __init__(self, store: AccountStore, row: int):
+        self.store = store
+        self.row = row
+
+    def __repr__(self) -> str:
+        return f"AccountView({self.id}, {self.first_name}, {self.last_name}, {self.rate})"
+
+    @property
+    def pay_raise(self) -> list:
+        return self.store.pay_raise(self.row)
+
+    @pay_raise.setter
+    def pay_raise(self, value: list) -> None:
+        raise AttributeError("Raise history is recorded by update_rate")
+
+    def _one(self, values: dict) -> dict:
+        return {key: value[0].item() for key, value in values.items()}
+
+    def update_rate(self, rate: float) -> dict:
+        return self._one(self.store.update_rate(rate, index=[self.row]))
+
+    def average_rate(self) -> dict:
+        return self._one(self.store.average_rate(index=[self.row]))
+
+    def add_hours(self, hours: float) -> dict:
+        return self._one(self.store.add_hours(hours, index=[self.row]))
+
+    def get_income(self) -> dict:
+        return self._one(self.store.get_income(index=[self.row]))
+
+    def pay(self, hours: float = 0) -> dict:
+        return self._one(self.store.pay(hours, index=[self.row]))
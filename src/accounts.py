@@ -1,18 +1,25 @@
+import collections
 import concurrent.futures
 import datetime
+import functools
+import itertools
 import json
 import os
+import pickle
 import random
-import time
-from typing import Any, Iterator
+from typing import Any, Iterator, Optional
 
 import names
+import numpy as np
+
+from src.instrumentation import add_bytes, instrumented, is_enabled
+
+ID_RANGE = (1_000_000_000, 99999999999999999)
 
 
 class Account:
     def __init__(self, id: int, first_name: str, last_name: str, rate: float, **kwargs: Any):
-        random.seed(time.time())
-        self.id = random.randrange(1_000_000_000, 99999999999999999) if id <= 1_000_000_000 else id
+        self.id = random.randrange(*ID_RANGE) if id <= 1_000_000_000 else id
         self.first_name = first_name
         self.last_name = last_name
         self.rate = rate if rate is not None else None
@@ -21,8 +28,10 @@ class Account:
         self.paid_hours: float = kwargs.get("paid_hours", 0)
         self.paid_income: float = kwargs.get("paid_income", 0)
         self.average_pay_rate: float = kwargs.get("average_pay_rate", 0)
-        self.pay_raise: list = kwargs.get(
-            "pay_raise", [[self.rate, str(datetime.datetime.now().astimezone())]]
+        self.pay_raise: list = (
+            kwargs["pay_raise"]
+            if "pay_raise" in kwargs
+            else [[self.rate, str(datetime.datetime.now().astimezone())]]
         )
 
     def __repr__(self) -> str:
@@ -37,6 +46,9 @@ class Account:
 
         return self.id == other.id
 
+    def __hash__(self) -> int:
+        return hash(self.id)
+
     def get_info(self) -> dict:
         return {
             "id": self.id,
@@ -102,27 +114,91 @@ class Account:
             "paid_income": self.paid_income,
         }
 
+    @instrumented
     def save(self) -> None:
         if not os.path.exists("data"):
             os.makedirs("data")
 
         with open(f"data/{self.id}.json", "w") as f:
-            f.write(str(self.get_info()))
+            json.dump(self.get_info(), f)
+            add_bytes("Account.save", f.tell())
 
 
-def generate_accounts(n: int) -> list:
-    accounts = []
-    for i in range(n):
-        accounts.append(
-            Account(
-                i,
-                names.get_first_name(),
-                names.get_last_name(),
-                round(random.normalvariate(30, 5), 2),
+class NameSampler:
+    """Samples names from the names package's frequency lists in vectorized batches.
+
+    Each list is read once into an array of names and an array of cumulative frequencies, so
+    drawing a batch of names is a single searchsorted instead of a file scan per name.
+    """
+
+    # The names package draws uniformly over [0, 90) of the cumulative frequency
+    FREQUENCY_SPAN = 90
+
+    def __init__(self, files: Optional[dict] = None):
+        self._lists = {}
+        for key, path in (files or names.FILES).items():
+            with open(path) as f:
+                rows = [line.split() for line in f if line.strip()]
+
+            # A draw past the last cumulative frequency gives an empty name, as in names.get_name
+            self._lists[key] = (
+                np.array([name.capitalize() for name, *_ in rows] + [""]),
+                np.array([float(cumulative) for _, _, cumulative, _ in rows]),
             )
+
+    def _sample(self, key: str, n: int, rng: np.random.Generator) -> np.ndarray:
+        names_list, cumulative = self._lists[key]
+        selected = rng.random(n) * self.FREQUENCY_SPAN
+        return names_list[np.searchsorted(cumulative, selected, side="right")]
+
+    def first_names(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        male = rng.random(n) < 0.5
+        return np.where(
+            male, self._sample("first:male", n, rng), self._sample("first:female", n, rng)
         )
 
-    return accounts
+    def last_names(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        return self._sample("last", n, rng)
+
+
+@functools.lru_cache(maxsize=None)
+def get_name_sampler() -> NameSampler:
+    return NameSampler()
+
+
+def generate_account_columns(n: int, rng: np.random.Generator) -> dict:
+    """Draw ids, names and rates for n synthetic accounts"""
+
+    sampler = get_name_sampler()
+    return {
+        "ids": rng.integers(*ID_RANGE, n),
+        "first_names": sampler.first_names(n, rng),
+        "last_names": sampler.last_names(n, rng),
+        "rates": np.round(rng.normal(30, 5, n), 2),
+    }
+
+
+def iter_generated_accounts(
+    n: int, batch_size: int = 10_000, seed: Optional[int] = None
+) -> Iterator[Account]:
+    """Lazily generate n synthetic accounts, drawing them in batches of batch_size"""
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, batch_size):
+        columns = generate_account_columns(min(batch_size, n - start), rng)
+        now = str(datetime.datetime.now().astimezone())
+        for id, first_name, last_name, rate in zip(
+            columns["ids"].tolist(),
+            columns["first_names"].tolist(),
+            columns["last_names"].tolist(),
+            columns["rates"].tolist(),
+        ):
+            yield Account(id, first_name, last_name, rate, pay_raise=[[rate, now]])
+
+
+@instrumented
+def generate_accounts(n: int, seed: Optional[int] = None) -> list:
+    return list(iter_generated_accounts(n, seed=seed))
 
 
 def generate_daily_events_for_an_account(account: Account) -> Account:
@@ -151,15 +227,14 @@ def generate_n_days_events_for_an_account(account: Account, n: int) -> Account:
     return account
 
 
-def generate_n_days_events_for_accounts(accounts: list, n: int) -> list:
-    """Generate n days events for accounts"""
+@instrumented
+def generate_n_days_events_for_accounts(accounts: list, n: int, seed: Any = None) -> list:
+    """Generate n days events for accounts, reproducibly when given a seed"""
 
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        accounts_events = executor.map(
-            generate_n_days_events_for_an_account, accounts, [n] * len(accounts)
-        )
+    from src.account_store import AccountStore
+    from src.simulation import simulate_n_days
 
-    return list(accounts_events)
+    return simulate_n_days(AccountStore.from_accounts(accounts), n, seed).to_accounts()
 
 
 def create_account_from_json(path: str) -> Account:
@@ -169,14 +244,69 @@ def create_account_from_json(path: str) -> Account:
     return Account(**data)
 
 
-def create_accounts_from_data_path(path: str) -> list[Account]:
-    """Create accounts from data path"""
+@instrumented
+def create_accounts_from_json_files(paths: list) -> list[Account]:
+    return [create_account_from_json(path) for path in paths]
+
+
+EXECUTORS = {
+    "process": concurrent.futures.ProcessPoolExecutor,
+    "thread": concurrent.futures.ThreadPoolExecutor,
+}
+
+
+@instrumented
+def iter_account_batches_from_data_path(
+    path: str,
+    batch_size: int = 1000,
+    executor: Optional[str] = "process",
+    max_workers: Optional[int] = None,
+) -> Iterator[list[Account]]:
+    """Stream accounts from data path in batches of at most batch_size.
+
+    The .json files are listed lazily with os.scandir and every worker task reads a whole
+    batch. Only a few batches per worker are in flight at once, so memory stays bounded however
+    many files the directory holds. Use executor="thread" for I/O-bound directories or None to read in
+    this process.
+    """
 
-    files = os.listdir(path)
+    if executor is not None and executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}")
 
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        accounts: Iterator[Account] = executor.map(
-            create_account_from_json, [os.path.join(path, f) for f in files]
+    with os.scandir(path) as entries:
+        # Other files, such as a saved AccountStore's accounts.npz, can share the directory
+        files = (
+            entry.path for entry in entries if entry.is_file() and entry.name.endswith(".json")
         )
+        batches = iter(lambda: list(itertools.islice(files, batch_size)), [])
+
+        if executor is None:
+            yield from map(create_accounts_from_json_files, batches)
+            return
+
+        max_workers = max_workers or os.cpu_count() or 1
+        with EXECUTORS[executor](max_workers=max_workers) as pool:
+            pending: collections.deque = collections.deque()
+            for batch in batches:
+                pending.append(pool.submit(create_accounts_from_json_files, batch))
+                if executor == "process" and is_enabled():
+                    add_bytes("iter_account_batches_from_data_path", len(pickle.dumps(batch)))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+
+def iter_accounts_from_data_path(path: str, **kwargs: Any) -> Iterator[Account]:
+    """Stream accounts from data path one at a time"""
+
+    for batch in iter_account_batches_from_data_path(path, **kwargs):
+        yield from batch
+
+
+@instrumented
+def create_accounts_from_data_path(path: str, **kwargs: Any) -> list[Account]:
+    """Create accounts from data path"""
 
-    return list(accounts)
+    return list(iter_accounts_from_data_path(path, **kwargs))
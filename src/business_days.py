@@ -0,0 +1,120 @@
+import functools
+import re
+from typing import Any, Iterable, Union
+
+import numpy as np
+
+# Strings NumPy parses the way pandas does, NumPy reads "20230101" as the year 20230101
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]|\Z)")
+
+
+def _parse_datetime(value: str) -> np.datetime64:
+    if _ISO_DATE.match(value):
+        return np.datetime64(value)
+
+    import pandas as pd
+
+    return pd.to_datetime(value).to_datetime64()
+
+
+def to_datetimes(dates: Any) -> np.ndarray:
+    """Convert dates, datetimes or date strings to datetime64, in days unless a time is given.
+
+    ISO strings are cast by NumPy and any other string is parsed by pandas as the weekday
+    helpers always have, so "20230101", "2023/01/01" and "Jan 1 2023" all mean 1 January 2023.
+    """
+
+    array = np.asarray(dates)
+    if array.dtype.kind == "M":
+        return array
+
+    if array.dtype.kind not in "OSU":
+        return array.astype("datetime64[D]")
+
+    values = array.ravel().tolist()
+    if all(isinstance(value, str) and _ISO_DATE.match(value) for value in values):
+        return array.astype("datetime64")
+
+    parsed = [_parse_datetime(value) if isinstance(value, str) else value for value in values]
+    return np.array(parsed, dtype="datetime64").reshape(array.shape)
+
+
+def to_days(dates: Any) -> np.ndarray:
+    """Dates of ``to_datetimes``, any time of day dropped"""
+
+    return to_datetimes(dates).astype("datetime64[D]")
+
+
+class BusinessDayCalendar:
+    """Business-day calendar backed by a prefix sum of business days over a fixed span.
+
+    Counting the business days between any two dates inside the span is two array lookups, so
+    scalars and whole arrays of start/end dates are answered in O(1) per pair. Dates outside the
+    span fall back to ``np.busday_count`` with the same holidays.
+    """
+
+    def __init__(
+        self,
+        start: Any = "1900-01-01",
+        end: Any = "2199-12-31",
+        holidays: Iterable[Any] = (),
+    ):
+        self.start = np.datetime64(start, "D")
+        self.end = np.datetime64(end, "D")
+
+        if self.end < self.start:
+            raise ValueError("End of the calendar span is before its start")
+
+        self.holidays = np.unique(to_days(list(holidays)))
+        self._busdaycal = np.busdaycalendar(holidays=self.holidays)
+
+        days = np.arange(self.start, self.end + 1)
+        self._cumulative = np.zeros(len(days) + 1, dtype=np.int64)
+        np.cumsum(np.is_busday(days, busdaycal=self._busdaycal), out=self._cumulative[1:])
+
+    def __repr__(self) -> str:
+        return f"BusinessDayCalendar({self.start}, {self.end}, {len(self.holidays)} holidays)"
+
+    def count(self, start_dates: Any, end_dates: Any) -> Union[int, np.ndarray]:
+        """Count business days from start to end, both inclusive.
+
+        With times of day, a business day counts as pd.date_range(start, end, freq="B") does,
+        when that day at the start's time of day falls within the range.
+        """
+
+        starts, ends = np.broadcast_arrays(to_datetimes(start_dates), to_datetimes(end_dates))
+        if not starts.dtype == ends.dtype == np.dtype("datetime64[D]"):
+            start_days, end_days = starts.astype("datetime64[D]"), ends.astype("datetime64[D]")
+            late = ends - end_days < starts - start_days
+            starts, ends = start_days, np.where(late, end_days - 1, end_days)
+
+        first = (starts - self.start).astype(np.int64)
+        last = (ends - self.start).astype(np.int64) + 1
+        in_span = (first >= 0) & (last < len(self._cumulative))
+
+        counts = np.array(
+            self._cumulative[np.where(in_span, last, 0)]
+            - self._cumulative[np.where(in_span, first, 0)]
+        )
+
+        if not in_span.all():
+            outside = ~in_span
+            counts[outside] = np.busday_count(
+                starts[outside], ends[outside] + 1, busdaycal=self._busdaycal
+            )
+
+        counts = np.maximum(counts, 0)
+        return int(counts) if counts.ndim == 0 else counts
+
+    def count_in_years(self, years: Any) -> Union[int, np.ndarray]:
+        """Count business days from 1 January to 31 December of each year"""
+
+        years = np.asarray(years, dtype=np.int64) - 1970
+        starts = years.astype("datetime64[Y]").astype("datetime64[D]")
+        ends = (years + 1).astype("datetime64[Y]").astype("datetime64[D]") - 1
+        return self.count(starts, ends)
+
+
+@functools.lru_cache(maxsize=None)
+def get_default_calendar() -> BusinessDayCalendar:
+    return BusinessDayCalendar()
@@ -0,0 +1,138 @@
+import os
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.income import compare_rates
+from src.periods import DEFAULT_PERIODS, INCOME_FIELDS, PERIOD_REGISTRY
+
+COMPARE_COLUMNS = ("rate", *INCOME_FIELDS, "rate_difference")
+
+
+def iter_compare_rates(
+    base_rate: float,
+    rates: Any,
+    daily_hours: float,
+    leave_days: int,
+    this_year: int,
+    periods: Iterable[str] = DEFAULT_PERIODS,
+    chunk_size: int = 65_536,
+) -> Iterator[pd.DataFrame]:
+    """Compare the sorted, de-duplicated rates plus the base rate in chunks of chunk_size rates.
+
+    Every chunk covers all the periods at once, so each rate is computed exactly once however
+    many periods are exported.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    periods = list(periods)
+    rates = np.unique(np.append(np.asarray(rates, dtype=np.float64), base_rate))
+    for start in range(0, len(rates), chunk_size):
+        yield compare_rates(
+            base_rate,
+            rates[start : start + chunk_size],
+            daily_hours,
+            leave_days,
+            this_year,
+            periods,
+        )
+
+
+def _round(chunk: pd.DataFrame, decimals: Optional[int]) -> pd.DataFrame:
+    if decimals is None:
+        return chunk
+
+    return chunk.round({column: decimals for column in COMPARE_COLUMNS[1:]})
+
+
+def _write_xlsx(path: str, chunks: Iterable, periods: list, decimals: Optional[int]) -> None:
+    """One sheet per period laid out like the legacy export, streamed in write-only mode"""
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheets = {}
+    for period in periods:
+        label = PERIOD_REGISTRY[period].label if period in PERIOD_REGISTRY else period
+        sheets[period] = workbook.create_sheet(period)
+        sheets[period].append(
+            [None, *[f"{label}_{field}" for field in INCOME_FIELDS], "rate", "hours"]
+        )
+
+    for chunk in chunks:
+        chunk = _round(chunk, decimals)
+        for period, group in chunk.groupby("period", observed=True, sort=False):
+            for row in group[list(COMPARE_COLUMNS)].itertuples(index=False, name=None):
+                sheets[period].append([*row, 0.0])
+
+    workbook.save(path)
+
+
+def _write_csv(path: str, chunks: Iterable, periods: list, decimals: Optional[int]) -> None:
+    """A single tidy table with a period column"""
+
+    with open(path, "w", newline="") as f:
+        for number, chunk in enumerate(chunks):
+            _round(chunk, decimals).to_csv(f, header=number == 0, index=False)
+
+
+def _write_parquet(path: str, chunks: Iterable, periods: list, decimals: Optional[int]) -> None:
+    """A single tidy table with a period column, one row group per chunk"""
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("Parquet export needs pyarrow, pip install pyarrow") from error
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(_round(chunk, decimals), preserve_index=False)
+            writer = writer or pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+EXPORT_WRITERS: dict = {"xlsx": _write_xlsx, "csv": _write_csv, "parquet": _write_parquet}
+
+
+def export_compare_rates(
+    path: str,
+    base_rate: float,
+    periods: Iterable[str],
+    rates: Any,
+    daily_hours: float,
+    leave_days: int,
+    this_year: int,
+    format: Optional[str] = None,
+    chunk_size: int = 65_536,
+    decimals: Optional[int] = 2,
+) -> str:
+    """Write the comparison of rates to a base rate for every period in a single pass.
+
+    The format is taken from the file extension unless given. Rates are computed and written
+    chunk by chunk, so memory stays bounded by chunk_size whatever the number of rates.
+    """
+
+    format = format or os.path.splitext(path)[1].lstrip(".").lower()
+    writer: Optional[Callable] = EXPORT_WRITERS.get(format)
+    if writer is None:
+        raise ValueError(f"Unknown export format: {format}")
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    periods = list(periods)
+    chunks = iter_compare_rates(
+        base_rate, rates, daily_hours, leave_days, this_year, periods, chunk_size
+    )
+    writer(path, chunks, periods, decimals)
+
+    return path
@@ -0,0 +1,283 @@
+from operator import add, mul, sub, truediv
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Union
+
+import numpy as np
+
+from src.business_days import get_default_calendar
+from src.periods import (
+    DEFAULT_PERIODS,
+    INCOME_FIELDS,
+    PERIOD_REGISTRY,
+    PeriodSchedule,
+    get_period_schedule,
+)
+from src.tax import calculate_tax_array, get_compiled_tax_schedules, get_tax_schedule
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+INCOME_RECORD_FIELDS = (*INCOME_FIELDS, "rate", "hours")
+INCOME_RECORD_DTYPE = np.dtype([(field, np.float64) for field in INCOME_RECORD_FIELDS])
+
+
+class IncomeRecords:
+    """Fixed-schema table of income records backed by a NumPy structured array.
+
+    ``+ - * /`` work row-wise between tables of the same length, broadcast a single record
+    across a batch, and accept plain numbers.
+    """
+
+    def __init__(self, data: Any):
+        self.data = np.atleast_1d(np.asarray(data, dtype=INCOME_RECORD_DTYPE))
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "IncomeRecords":
+        columns = {field: np.asarray(columns[field]) for field in INCOME_RECORD_FIELDS}
+        data = np.empty(
+            np.broadcast_shapes(*(c.shape for c in columns.values())), INCOME_RECORD_DTYPE
+        )
+        for field, column in columns.items():
+            data[field] = column
+
+        return cls(data)
+
+    @classmethod
+    def from_dicts(cls, income_dicts: list, label: str = "yearly") -> "IncomeRecords":
+        return cls.from_columns(
+            {
+                field: [income_dict[_key(field, label)] for income_dict in income_dicts]
+                for field in INCOME_RECORD_FIELDS
+            }
+        )
+
+    def to_dicts(self, label: str = "yearly") -> list:
+        keys = [_key(field, label) for field in INCOME_RECORD_FIELDS]
+        return [dict(zip(keys, row)) for row in self.data.tolist()]
+
+    def __repr__(self) -> str:
+        return f"IncomeRecords({len(self)} records)"
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key: Any) -> Union[np.ndarray, "IncomeRecords"]:
+        if isinstance(key, str):
+            return self.data[key]
+
+        return IncomeRecords(self.data[key])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IncomeRecords):
+            return NotImplemented
+
+        return np.array_equal(self.data, other.data)
+
+    def values(self) -> np.ndarray:
+        """Two-dimensional float view of the records, one column per field"""
+
+        data = np.ascontiguousarray(self.data)
+        return data.view(np.float64).reshape(len(data), len(INCOME_RECORD_FIELDS))
+
+    def _operate(self, other: Any, operator: Callable) -> "IncomeRecords":
+        other_values = other.values() if isinstance(other, IncomeRecords) else other
+        values = np.ascontiguousarray(operator(self.values(), other_values), dtype=np.float64)
+        return IncomeRecords(values.view(INCOME_RECORD_DTYPE).reshape(-1))
+
+    def __add__(self, other: Any) -> "IncomeRecords":
+        return self._operate(other, add)
+
+    def __sub__(self, other: Any) -> "IncomeRecords":
+        return self._operate(other, sub)
+
+    def __mul__(self, other: Any) -> "IncomeRecords":
+        return self._operate(other, mul)
+
+    def __truediv__(self, other: Any) -> "IncomeRecords":
+        return self._operate(other, truediv)
+
+    def per_period(self, schedule: PeriodSchedule, period: str) -> "IncomeRecords":
+        """Express yearly records per period, leaving rate and hours untouched"""
+
+        divisors = np.ones(len(INCOME_RECORD_FIELDS))
+        divisors[: len(INCOME_FIELDS)] = schedule.divisors[period]
+        return self / divisors
+
+
+def _key(field: str, label: str) -> str:
+    return f"{label}_{field}" if field in INCOME_FIELDS else field
+
+
+def _yearly_income_columns(
+    rates: np.ndarray, daily_hours: float, weekdays: Any, years: Any
+) -> dict:
+    # Tax and super come from the schedule of each income's year
+    incomes = daily_hours * rates * weekdays
+    taxes = calculate_tax_array(incomes, years)
+    take_homes = incomes - taxes
+    supers = incomes * get_compiled_tax_schedules().super_rate(years)
+
+    return {
+        "income": incomes,
+        "tax": taxes,
+        "take_home": take_homes,
+        "super": supers,
+        "take_home_plus_super": take_homes + supers,
+        "income_plus_super": incomes + supers,
+        "rate": rates,
+        "hours": daily_hours,
+    }
+
+
+def create_yearly_income_records(
+    daily_rates: Any, daily_hours: float, leave_days: int, this_year: int
+) -> IncomeRecords:
+    """Compute every yearly income column for an array of daily rates in one pass"""
+
+    weekdays = get_period_schedule(this_year, leave_days).weekdays
+    rates = np.asarray(daily_rates, dtype=np.float64)
+
+    return IncomeRecords.from_columns(
+        _yearly_income_columns(rates, daily_hours, weekdays, this_year)
+    )
+
+
+def compare_rates(
+    base_rate: float,
+    rates: Any,
+    daily_hours: float,
+    leave_days: int,
+    this_year: int,
+    periods: Iterable[str] = DEFAULT_PERIODS,
+) -> "pd.DataFrame":
+    """Compare an array of daily rates to a base rate for every period at once.
+
+    Returns a tidy DataFrame with one row per (period, rate) holding the differences of each
+    income column from the base rate, expressed per period.
+    """
+
+    import pandas as pd
+
+    periods = list(periods)
+    rates = np.asarray(rates)
+    schedule = get_period_schedule(this_year, leave_days)
+
+    records = create_yearly_income_records(rates, daily_hours, leave_days, this_year)
+    base_record = create_yearly_income_records(base_rate, daily_hours, leave_days, this_year)
+    per_period = [
+        (records.per_period(schedule, period) - base_record.per_period(schedule, period)).data
+        for period in periods
+    ]
+    differences = np.concatenate(per_period) if per_period else records.data[:0]
+
+    compare = {
+        "period": pd.Categorical.from_codes(
+            np.repeat(np.arange(len(periods)), len(rates)), periods
+        ),
+        "rate": np.tile(rates, len(periods)),
+    }
+    for field in INCOME_FIELDS:
+        compare[field] = differences[field]
+    compare["rate_difference"] = differences["rate"]
+
+    return pd.DataFrame(compare)
+
+
+def project_income(
+    daily_rates: Any,
+    daily_hours: float,
+    leave_days: int,
+    years: Any,
+    escalation: Any = 0.0,
+    periods: Iterable[str] = DEFAULT_PERIODS,
+) -> "pd.DataFrame":
+    """Project daily rates over an array of years for every period at once.
+
+    ``escalation`` is the yearly rise of the rates: a scalar applies every year after the first
+    and an array gives one cumulative rise per year (its first entry applies to the first
+    year). Business days are counted once per year and broadcast across the rates. Returns a
+    tidy DataFrame with one row per (period, year, rate) holding the starting rate, the
+    escalated ``daily_rate`` and each income column expressed per period.
+    """
+
+    import pandas as pd
+
+    periods = list(periods)
+    unknown = [period for period in periods if period not in PERIOD_REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown periods: {unknown}")
+
+    years = np.atleast_1d(np.asarray(years, dtype=np.int64))
+    rates = np.atleast_1d(np.asarray(daily_rates, dtype=np.float64))
+    escalation = np.asarray(escalation, dtype=np.float64)
+    if escalation.ndim == 0:
+        escalation = np.r_[0.0, np.full(max(len(years) - 1, 0), escalation)]
+    elif escalation.shape != years.shape:
+        raise ValueError("Need one escalation per year")
+
+    # (years, rates) grids of daily rates and yearly income columns
+    weekdays = np.asarray(get_default_calendar().count_in_years(years)) - leave_days
+    daily_rates = rates * np.cumprod(1 + escalation)[:, None]
+    yearly = _yearly_income_columns(daily_rates, daily_hours, weekdays[:, None], years[:, None])
+
+    divisors = {
+        period: np.array(
+            [PERIOD_REGISTRY[period].divisor(days) for days in weekdays.tolist()], np.float64
+        )[:, None]
+        for period in periods
+    }
+
+    n = daily_rates.size
+    projection = {
+        "period": pd.Categorical.from_codes(np.repeat(np.arange(len(periods)), n), periods),
+        "year": np.tile(np.repeat(years, len(rates)), len(periods)),
+        "rate": np.tile(rates, len(years) * len(periods)),
+        "daily_rate": np.tile(daily_rates.ravel(), len(periods)),
+    }
+    for field in INCOME_FIELDS:
+        projection[field] = (
+            np.concatenate([(yearly[field] / divisors[period]).ravel() for period in periods])
+            if periods
+            else np.empty(0)
+        )
+
+    return pd.DataFrame(projection)
+
+
+def solve_daily_rates(
+    take_homes: Any,
+    daily_hours: Any,
+    leave_days: Any,
+    this_year: int,
+    period: str = "year",
+) -> IncomeRecords:
+    """Daily rates (and their incomes) that give target take-home pays, in closed form.
+
+    ``take_homes`` are per ``period`` and broadcast with ``daily_hours`` and ``leave_days``.
+    Every target is solved on the piecewise-linear take-home curve of the year's tax schedule,
+    so no rates are searched.
+    """
+
+    if period not in PERIOD_REGISTRY:
+        raise ValueError(f"Unknown period: {period}")
+
+    take_homes, daily_hours, leave_days = np.broadcast_arrays(
+        np.asarray(take_homes, dtype=np.float64),
+        np.asarray(daily_hours, dtype=np.float64),
+        np.asarray(leave_days, dtype=np.int64),
+    )
+
+    # Working days and period divisors once per distinct number of leave days
+    leave, inverse = np.unique(leave_days, return_inverse=True)
+    schedules = [get_period_schedule(this_year, days) for days in leave.tolist()]
+    weekdays = np.array([schedule.weekdays for schedule in schedules], np.float64)[inverse]
+    divisors = np.array([schedule.divisors[period] for schedule in schedules], np.float64)
+
+    weekdays = weekdays.reshape(take_homes.shape)
+    incomes = get_tax_schedule(this_year).income_for_take_home(
+        take_homes * divisors[inverse].reshape(take_homes.shape)
+    )
+    rates = incomes / (daily_hours * weekdays)
+
+    return IncomeRecords.from_columns(
+        _yearly_income_columns(rates, daily_hours, weekdays, this_year)
+    )
@@ -0,0 +1,301 @@
+import math
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from src.account_store import AccountStore
+from src.accounts import generate_account_columns
+from src.periods import resolve_year
+from src.simulation import RandomStreams, Seed, simulate_daily_events
+from src.tax import calculate_tax_array, get_tax_schedule
+
+MONTE_CARLO_METRICS = ("wages", "tax", "super", "total_cost", "raises")
+
+# Spawn key branch of the sketch seeds, clear of the replication numbers
+SKETCH_SPAWN_KEY = 2**32
+
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum of a stream, in constant memory.
+
+    Batches are folded in with Welford's update generalised to batches (Chan et al.), so two
+    partial results from different workers merge exactly as if one had seen all the values.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __repr__(self) -> str:
+        return f"RunningStats(count={self.count}, mean={self.mean}, std={self.std})"
+
+    def _combine(self, count: int, mean: float, m2: float, low: float, high: float) -> None:
+        if not count:
+            return
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def update(self, values: Any) -> "RunningStats":
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values):
+            mean = values.mean()
+            self._combine(
+                len(values),
+                float(mean),
+                float(((values - mean) ** 2).sum()),
+                float(values.min()),
+                float(values.max()),
+            )
+
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch in the style of KLL.
+
+    Values are kept in levels of compactors where an item at level ``h`` stands for ``2**h``
+    values. A full level is sorted and every other item (from a random offset) is promoted to
+    the next level, so memory grows only with log(count) and the rank error with 1/k.
+    """
+
+    def __init__(self, k: int = 200, seed: Seed = None):
+        if k < 2:
+            raise ValueError("Sketch size must be at least 2")
+
+        self.k = k
+        self.count = 0
+        self.levels: list = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __repr__(self) -> str:
+        return f"QuantileSketch(k={self.k}, count={self.count}, retained={self.retained})"
+
+    @property
+    def retained(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def _capacity(self, level: int) -> int:
+        # Lower levels get geometrically smaller compactors
+        return max(2, math.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - level)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                items = np.sort(items)
+                kept, items = items[len(items) - len(items) % 2 :], items[: len(items) // 2 * 2]
+                promoted = items[self._rng.integers(2) :: 2]
+                self.levels[level] = kept
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+            level += 1
+
+    def update(self, values: Any) -> "QuantileSketch":
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+
+        self.count += other.count
+        self._compress()
+
+        return self
+
+    def quantile(self, q: Any) -> Any:
+        """Approximate q-quantiles, NaN for an empty sketch"""
+
+        q = np.asarray(q, dtype=np.float64)
+        if not self.retained:
+            return np.full(q.shape, np.nan)[()]
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2.0**height) for height, level in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        ranks = np.cumsum(weights[order])
+        positions = np.searchsorted(ranks, q * ranks[-1], side="left")
+        return items[order][np.minimum(positions, len(items) - 1)][()]
+
+
+class MonteCarloSummary:
+    """Running statistics and a quantile sketch of every Monte Carlo metric.
+
+    The sketches draw their compaction offsets from generators spawned from seed, so a seeded
+    summary fed the same values gives the same quantiles.
+    """
+
+    def __init__(
+        self, metrics: Iterable[str] = MONTE_CARLO_METRICS, k: int = 200, seed: Seed = None
+    ):
+        self.stats = {metric: RunningStats() for metric in metrics}
+        root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.sketches = {
+            metric: QuantileSketch(k, seed=sketch_seed)
+            for metric, sketch_seed in zip(self.stats, root.spawn(len(self.stats)))
+        }
+
+    def __repr__(self) -> str:
+        return f"MonteCarloSummary({self.replications} replications)"
+
+    @property
+    def replications(self) -> int:
+        return next(iter(self.stats.values())).count if self.stats else 0
+
+    def update(self, results: dict) -> "MonteCarloSummary":
+        for metric, values in results.items():
+            self.stats[metric].update(values)
+            self.sketches[metric].update(values)
+
+        return self
+
+    def merge(self, other: "MonteCarloSummary") -> "MonteCarloSummary":
+        for metric in self.stats:
+            self.stats[metric].merge(other.stats[metric])
+            self.sketches[metric].merge(other.sketches[metric])
+
+        return self
+
+    def to_dict(self, quantiles: Iterable[float] = (0.05, 0.5, 0.95)) -> dict:
+        quantiles = list(quantiles)
+        return {
+            metric: {
+                **self.stats[metric].to_dict(),
+                "quantiles": dict(
+                    zip(
+                        quantiles, np.atleast_1d(self.sketches[metric].quantile(quantiles)).tolist()
+                    )
+                ),
+            }
+            for metric in self.stats
+        }
+
+
+def _replication_seed(root: np.random.SeedSequence, replication: int) -> np.random.SeedSequence:
+    # Same as root.spawn(...)[replication], without spawning the earlier children
+    return np.random.SeedSequence(root.entropy, spawn_key=(*root.spawn_key, replication))
+
+
+def _sketch_seed(root: np.random.SeedSequence, start: int) -> np.random.SeedSequence:
+    # Workers starting at different replications get different sketch seeds
+    return np.random.SeedSequence(
+        root.entropy, spawn_key=(*root.spawn_key, SKETCH_SPAWN_KEY, start)
+    )
+
+
+def simulate_replications(
+    n_accounts: int,
+    n_days: int,
+    replications: Iterable[int],
+    root: np.random.SeedSequence,
+    this_year: int,
+) -> dict:
+    """Simulate a batch of replications side by side in one store, returns each one's metrics.
+
+    Every replication generates its population and draws its events from its own seed, so a
+    replication's result does not depend on the batch it runs in.
+    """
+
+    replications = list(replications)
+    seeds = [_replication_seed(root, replication).spawn(2) for replication in replications]
+    store = AccountStore.concat(
+        AccountStore(**generate_account_columns(n_accounts, np.random.default_rng(population)))
+        for population, _ in seeds
+    )
+
+    streams = RandomStreams([events for _, events in seeds], len(store), n_accounts)
+    for _ in range(n_days):
+        simulate_daily_events(store, streams)
+
+    # Earnings of each account over the simulated days, taxed as that year's income
+    earnings = (store.paid_income + store.unpaid_income).reshape(len(replications), n_accounts)
+    wages = earnings.sum(axis=1)
+    super_ = wages * get_tax_schedule(this_year).super_rate
+    raises = np.bincount(store.rate_history.rows // n_accounts, minlength=len(replications))[
+        : len(replications)
+    ]
+
+    return {
+        "wages": wages,
+        "tax": calculate_tax_array(earnings, this_year).sum(axis=1),
+        "super": super_,
+        "total_cost": wages + super_,
+        "raises": raises - n_accounts,
+    }
+
+
+def run_monte_carlo(
+    n_accounts: int,
+    n_days: int,
+    replications: int,
+    batch_size: int = 16,
+    seed: Seed = None,
+    start: int = 0,
+    this_year: Optional[int] = None,
+    k: int = 200,
+) -> MonteCarloSummary:
+    """Run replications start:start + replications of the payroll simulation in batches.
+
+    Results are folded into a ``MonteCarloSummary`` batch by batch, so memory depends on
+    n_accounts * batch_size and not on the number of replications. Workers running disjoint
+    ranges of replications with the same seed produce summaries that ``merge`` into the
+    summary of the whole run.
+    """
+
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+
+    if n_accounts < 1:
+        raise ValueError("Need at least one account per replication")
+
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    this_year = resolve_year(this_year)
+    summary = MonteCarloSummary(k=k, seed=_sketch_seed(root, start))
+    for first in range(start, start + replications, batch_size):
+        batch = range(first, min(first + batch_size, start + replications))
+        summary.update(simulate_replications(n_accounts, n_days, batch, root, this_year))
+
+    return summary
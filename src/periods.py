@@ -0,0 +1,108 @@
+import datetime
+import functools
+from typing import Callable, Iterable, Optional
+
+INCOME_FIELDS = (
+    "income",
+    "tax",
+    "take_home",
+    "super",
+    "take_home_plus_super",
+    "income_plus_super",
+)
+
+
+class Period:
+    """A way of slicing a working year, e.g. into months or weekdays.
+
+    ``divisor`` maps the number of working days in the year (after leave) to the number of
+    periods in that year, and ``label`` is used to name the period's income keys.
+    """
+
+    def __init__(self, name: str, label: str, divisor: Callable[[int], float]):
+        self.name = name
+        self.label = label
+        self.divisor = divisor
+
+    def __repr__(self) -> str:
+        return f"Period({self.name}, {self.label})"
+
+
+def resolve_year(this_year: Optional[int]) -> int:
+    """The given year, or the current one when None"""
+
+    return datetime.date.today().year if this_year is None else this_year
+
+
+PERIOD_REGISTRY: dict = {}
+DEFAULT_PERIODS = ("year", "months", "biweeks", "weeks", "weekdays", "hours")
+
+
+def register_period(name: str, label: str, divisor: Callable[[int], float]) -> Period:
+    PERIOD_REGISTRY[name] = Period(name, label, divisor)
+    get_period_schedule.cache_clear()
+
+    return PERIOD_REGISTRY[name]
+
+
+class PeriodSchedule:
+    """Divisors and income key names of every period for one (year, leave days) pair"""
+
+    def __init__(self, this_year: int, leave_days: int = 0, periods: Optional[Iterable] = None):
+        self.this_year = this_year
+        self.leave_days = leave_days
+        from src.business_days import get_default_calendar
+
+        self.weekdays = int(get_default_calendar().count_in_years(this_year)) - leave_days
+        self.periods = tuple(periods) if periods is not None else tuple(PERIOD_REGISTRY)
+
+        unknown = [period for period in self.periods if period not in PERIOD_REGISTRY]
+        if unknown:
+            raise ValueError(f"Unknown periods: {unknown}")
+
+        self.divisors = {
+            period: PERIOD_REGISTRY[period].divisor(self.weekdays) for period in self.periods
+        }
+        self.keys = {
+            period: [
+                (f"yearly_{field}", f"{PERIOD_REGISTRY[period].label}_{field}")
+                for field in INCOME_FIELDS
+            ]
+            for period in self.periods
+        }
+
+    def __repr__(self) -> str:
+        return f"PeriodSchedule({self.this_year}, {self.leave_days}, {self.periods})"
+
+    def view(self, yearly_income_dict: dict, period: str) -> dict:
+        """Express a yearly income dict per period"""
+
+        divisor = self.divisors[period]
+        income_dict = {
+            key: yearly_income_dict[yearly_key] / divisor for yearly_key, key in self.keys[period]
+        }
+        income_dict["rate"] = float(yearly_income_dict["rate"])
+        income_dict["hours"] = float(yearly_income_dict["hours"])
+
+        return income_dict
+
+    def views(self, yearly_income_dict: dict, periods: Optional[Iterable] = None) -> dict:
+        return {
+            period: self.view(yearly_income_dict, period)
+            for period in (periods if periods is not None else self.periods)
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_period_schedule(this_year: int, leave_days: int = 0) -> PeriodSchedule:
+    return PeriodSchedule(this_year, leave_days)
+
+
+register_period("year", "yearly", lambda weekdays: 1)
+register_period("months", "monthly", lambda weekdays: round(weekdays / 22, 0))
+register_period("biweeks", "biweekly", lambda weekdays: round(weekdays / 10, 0))
+register_period("weeks", "weekly", lambda weekdays: round(weekdays / 5, 0))
+register_period("weekdays", "daily", lambda weekdays: weekdays)
+register_period("hours", "hourly", lambda weekdays: weekdays * 8)
+register_period("fortnights", "fortnightly", lambda weekdays: round(weekdays / 10, 0))
+register_period("quarters", "quarterly", lambda weekdays: round(weekdays / 66, 0))
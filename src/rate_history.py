@@ -0,0 +1,223 @@
+import datetime
+import time
+from typing import Any, Optional, Union
+
+import numpy as np
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Lookups of up to this many queries binary-search the index, larger ones merge-sort
+POINT_LOOKUP_LIMIT = 256
+
+
+def now_us() -> int:
+    return time.time_ns() // 1000
+
+
+def _parse_us(value: Union[str, datetime.datetime]) -> int:
+    moment = (
+        value if isinstance(value, datetime.datetime) else datetime.datetime.fromisoformat(value)
+    )
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+
+    return (moment - EPOCH) // MICROSECOND
+
+
+def to_epoch_us(values: Any) -> np.ndarray:
+    """Convert datetimes, ISO strings, datetime64s or epoch microseconds to int64 microseconds"""
+
+    array = np.asarray(values)
+    if array.dtype.kind == "M":
+        return array.astype("datetime64[us]").astype(np.int64)
+
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64)
+
+    return np.array([_parse_us(value) for value in array.ravel().tolist()], np.int64).reshape(
+        array.shape
+    )
+
+
+def format_epoch_us(us: int) -> str:
+    """Format epoch microseconds like str(datetime.datetime.now().astimezone())"""
+
+    return str((EPOCH + datetime.timedelta(microseconds=int(us))).astimezone())
+
+
+class RateHistory:
+    """Append-only history of account rates stored as parallel arrays.
+
+    Each entry is an account row, an int64 epoch-microsecond timestamp and the rate the account
+    had from that moment. Appends grow the arrays geometrically (amortized O(1)). Per-row lookups
+    binary-search an index sorted by (row, time) and scan the entries appended since it was
+    built, which is only rebuilt once that tail outgrows a fraction of the index. Point-in-time
+    lookups of a few queries binary-search the same index and large bulk lookups sort the
+    queries in with the entries in one pass.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(capacity, 1)
+        self._rows = np.empty(capacity, dtype=np.int64)
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._rates = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+        # Entries [0, _indexed) sorted by (row, time), and their rows in that order
+        self._order: Optional[np.ndarray] = None
+        self._sorted_rows = np.empty(0, dtype=np.int64)
+        self._sorted_times = np.empty(0, dtype=np.int64)
+        self._indexed = 0
+
+    @classmethod
+    def from_arrays(cls, rows: Any, times: Any, rates: Any) -> "RateHistory":
+        history = cls(len(rows))
+        history.append(rows, rates, times)
+        return history
+
+    def __repr__(self) -> str:
+        return f"RateHistory({self._size} entries)"
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self._rows[: self._size]
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[: self._size]
+
+    @property
+    def rates(self) -> np.ndarray:
+        return self._rates[: self._size]
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._rows)
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        for name in ("_rows", "_times", "_rates"):
+            grown = np.empty(capacity, dtype=getattr(self, name).dtype)
+            grown[: self._size] = getattr(self, name)[: self._size]
+            setattr(self, name, grown)
+
+    def append(self, rows: Any, rates: Any, times: Any = None) -> None:
+        """Record that rows got rates at times (now by default), scalars broadcast"""
+
+        times = now_us() if times is None else times
+        rows, rates, times = np.broadcast_arrays(
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(rates, dtype=np.float64),
+            to_epoch_us(times),
+        )
+        rows, rates, times = rows.ravel(), rates.ravel(), times.ravel()
+
+        start, stop = self._size, self._size + len(rows)
+        self._reserve(stop)
+        self._rows[start:stop] = rows
+        self._rates[start:stop] = rates
+        self._times[start:stop] = times
+        self._size = stop
+
+    def extend(self, other: "RateHistory", row_offset: int = 0) -> None:
+        self.append(other.rows + row_offset, other.rates, other.times)
+
+    def _index(self, rebuild: bool = False) -> np.ndarray:
+        # Appended entries are scanned until they outgrow an eighth of the index
+        pending = self._size - self._indexed
+        if self._order is None or rebuild and pending or pending > max(1024, self._indexed // 8):
+            self._order = np.lexsort((self.times, self.rows))
+            self._sorted_rows = self.rows[self._order]
+            self._sorted_times = self.times[self._order]
+            self._indexed = self._size
+
+        return self._order
+
+    def for_row(self, row: int) -> tuple:
+        """Times and rates of one row, in time order"""
+
+        order = self._index()
+        start, stop = np.searchsorted(self._sorted_rows, [row, row + 1], "left")
+        entries = order[start:stop]
+
+        pending = self._indexed + np.flatnonzero(self._rows[self._indexed : self._size] == row)
+        if len(pending):
+            entries = np.concatenate([entries, pending])
+            entries = entries[np.argsort(self._times[entries], kind="stable")]
+
+        return self.times[entries], self.rates[entries]
+
+    def split(self, n: int) -> tuple:
+        """Times and rates of rows 0 to n - 1 as two lists of per-row arrays, in time order"""
+
+        order = self._index(rebuild=True)
+        bounds = np.searchsorted(self._sorted_rows, np.arange(1, n), "left")
+        return np.split(self.times[order], bounds), np.split(self.rates[order], bounds)
+
+    def rate_at(self, rows: Any, times: Any) -> np.ndarray:
+        """Rate each row had at each time, NaN before a row's first entry"""
+
+        rows, times = np.broadcast_arrays(np.asarray(rows, dtype=np.int64), to_epoch_us(times))
+        shape = rows.shape
+        rows, times = rows.ravel(), times.ravel()
+        if len(rows) > POINT_LOOKUP_LIMIT:
+            return self._merge_rate_at(rows, times).reshape(shape)
+
+        return self._search_rate_at(rows, times).reshape(shape)
+
+    def _search_rate_at(self, rows: np.ndarray, times: np.ndarray) -> np.ndarray:
+        # Binary search of each query in its row of the index, then a scan of the pending tail
+        order = self._index()
+        starts = np.searchsorted(self._sorted_rows, rows, "left")
+        stops = np.searchsorted(self._sorted_rows, rows, "right")
+        tail_rows = self._rows[self._indexed : self._size]
+        tail_times = self._times[self._indexed : self._size]
+
+        result = np.full(len(rows), np.nan)
+        for i, (row, moment, start, stop) in enumerate(
+            zip(rows.tolist(), times.tolist(), starts.tolist(), stops.tolist())
+        ):
+            latest = start + int(np.searchsorted(self._sorted_times[start:stop], moment, "right"))
+            entry = order[latest - 1] if latest > start else -1
+
+            # An appended entry wins over an indexed one at the same time, as it came later
+            matches = np.flatnonzero((tail_rows == row) & (tail_times <= moment))
+            if len(matches):
+                last = matches[::-1][np.argmax(tail_times[matches][::-1])]
+                if entry < 0 or tail_times[last] >= self._times[entry]:
+                    entry = self._indexed + last
+
+            if entry >= 0:
+                result[i] = self._rates[entry]
+
+        return result
+
+    def _merge_rate_at(self, rows: np.ndarray, times: np.ndarray) -> np.ndarray:
+        n = self._size
+
+        # Sort entries and queries together, an entry sorts before a query at the same time
+        all_rows = np.concatenate([self.rows, rows])
+        all_times = np.concatenate([self.times, times])
+        kinds = np.concatenate([np.zeros(n, dtype=np.int8), np.ones(len(rows), dtype=np.int8)])
+        order = np.lexsort((kinds, all_times, all_rows))
+
+        # Position of the latest entry at or before every sorted position
+        is_entry = order < n
+        latest = np.maximum.accumulate(np.where(is_entry, np.arange(len(order)), -1))
+
+        query_positions = np.flatnonzero(~is_entry)
+        candidates = np.where(latest[query_positions] >= 0, order[latest[query_positions]], 0)
+        queries = order[query_positions] - n
+
+        found = latest[query_positions] >= 0
+        found &= self._rows[candidates] == rows[queries] if n else False
+        result = np.full(len(rows), np.nan)
+        result[queries] = np.where(found, self._rates[candidates], np.nan)
+
+        return result
@@ -0,0 +1,154 @@
+from typing import Any, Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from src.account_store import AccountStore
+from src.accounts import ID_RANGE, Account
+
+ID_MODES = ("sequential", "random")
+
+
+class AccountRegistry:
+    """Index of accounts by id with collision-free id allocation.
+
+    Single lookups go through a dict from id to row and bulk lookups of id arrays through a
+    sorted copy of the ids, so finding accounts never scans the population. A registry either
+    owns a list of ``Account`` objects or indexes the rows of an ``AccountStore``, in which
+    case ``rows`` gives the index to pass to the store's bulk methods.
+    """
+
+    def __init__(self, accounts: Iterable[Account] = (), seed: Optional[int] = None):
+        self.accounts: Union[list, AccountStore] = []
+        self._rows: dict = {}
+        self._reserved: set = set()
+        self._next_id = ID_RANGE[0] + 1
+        self._rng = np.random.default_rng(seed)
+        self._sorted_ids: Optional[np.ndarray] = None
+        self._sorted_rows: Optional[np.ndarray] = None
+
+        for account in accounts:
+            self.add(account)
+
+    @classmethod
+    def from_store(cls, store: AccountStore, seed: Optional[int] = None) -> "AccountRegistry":
+        registry = cls(seed=seed)
+        registry.reindex(store)
+        return registry
+
+    def reindex(self, store: AccountStore) -> None:
+        """Index a new store, typically the old one concatenated with accounts given ids here.
+
+        Allocated ids the store now holds are registered and no longer need reserving.
+        """
+
+        if len(np.unique(store.id)) != len(store):
+            raise ValueError("Duplicate account ids in store")
+
+        self.accounts = store
+        self._rows = dict(zip(store.id.tolist(), range(len(store))))
+        self._reserved.difference_update(self._rows)
+        self._sorted_ids = self._sorted_rows = None
+
+    def __repr__(self) -> str:
+        return f"AccountRegistry({len(self)} accounts)"
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._rows)
+
+    def __getitem__(self, id: int) -> Account:
+        return self.accounts[self._rows[id]]
+
+    def get(self, id: int, default: Any = None) -> Any:
+        return self[id] if id in self._rows else default
+
+    def _is_taken(self, id: int) -> bool:
+        return id in self._rows or id in self._reserved
+
+    def allocate_ids(self, n: int, mode: str = "sequential") -> np.ndarray:
+        """Allocate n ids that no registered or previously allocated account uses.
+
+        Sequential ids count up from the first id of ID_RANGE, skipping taken ids, and are never
+        handed out twice since random ids are drawn above the sequence. Random ids are reserved
+        until they are registered.
+        """
+
+        if mode not in ID_MODES:
+            raise ValueError(f"Unknown id mode: {mode}")
+
+        if mode == "sequential":
+            # Skip ids already registered or handed out by random allocation
+            ids = np.empty(0, dtype=np.int64)
+            while len(ids) < n:
+                stop = self._next_id + n - len(ids)
+                if stop > ID_RANGE[1]:
+                    raise ValueError("Sequential ids are exhausted")
+
+                free = [id for id in range(self._next_id, stop) if not self._is_taken(id)]
+                ids = np.concatenate([ids, np.array(free, np.int64)])
+                self._next_id = stop
+        else:
+            ids = np.empty(0, dtype=np.int64)
+            while len(ids) < n:
+                drawn = self._rng.integers(*ID_RANGE, n - len(ids), dtype=np.int64)
+                drawn = np.unique(np.concatenate([ids, drawn]))
+                ids = np.array(
+                    [id for id in drawn.tolist() if id >= self._next_id and not self._is_taken(id)],
+                    np.int64,
+                )
+
+            ids = self._rng.permutation(ids)
+            self._reserved.update(ids.tolist())
+
+        return ids
+
+    def add(self, account: Account) -> int:
+        if isinstance(self.accounts, AccountStore):
+            raise TypeError("Accounts of a store-backed registry are added through the store")
+
+        if account.id in self._rows:
+            raise ValueError(f"Duplicate account id: {account.id}")
+
+        self._rows[account.id] = len(self.accounts)
+        self.accounts.append(account)
+
+        self._reserved.discard(account.id)
+        self._sorted_ids = self._sorted_rows = None
+
+        return self._rows[account.id]
+
+    def create(
+        self, first_name: str, last_name: str, rate: float, mode: str = "sequential", **kwargs: Any
+    ) -> Account:
+        """Create and register an account with a freshly allocated id"""
+
+        account = Account(int(self.allocate_ids(1, mode)[0]), first_name, last_name, rate, **kwargs)
+        self.add(account)
+
+        return account
+
+    def rows(self, ids: Any) -> np.ndarray:
+        """Rows of an array of ids, raises KeyError if any id is not registered"""
+
+        if self._sorted_ids is None or self._sorted_rows is None:
+            ids_by_row = np.fromiter(self._rows, dtype=np.int64, count=len(self._rows))
+            order = np.argsort(ids_by_row)
+            self._sorted_ids = ids_by_row[order]
+            self._sorted_rows = np.fromiter(self._rows.values(), np.int64, len(self._rows))[order]
+
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = np.searchsorted(self._sorted_ids, ids)
+        positions = np.minimum(positions, len(self._sorted_ids) - 1)
+        found = self._sorted_ids[positions] == ids if len(self._sorted_ids) else ids != ids
+        if not np.all(found):
+            raise KeyError(f"Unknown account ids: {ids[~found][:10].tolist()}")
+
+        return self._sorted_rows[positions]
+
+    def get_many(self, ids: Any) -> list:
+        return [self.accounts[row] for row in self.rows(ids).tolist()]
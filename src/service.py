@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import socketserver
+import stat
+import sys
+from typing import IO, Any, Callable, Iterable, Optional
+
+import src.utils as utils
+from src.periods import get_period_schedule, resolve_year
+
+# Request types, named after and taking the same arguments as the functions in src/utils.py
+SERVICE_FUNCTIONS: dict = {
+    name: getattr(utils, name)
+    for name in (
+        "calculate_tax",
+        "get_number_of_weekdays",
+        "get_number_of_weekdays_in_year_minus_leave",
+        "create_yearly_income_dict",
+        "create_x_income_dict",
+        "create_all_x_income_dicts",
+        "create_all_x_income_dicts_for_multiple_rates",
+        "operate_dicts",
+        "compare_rates_to_base_rate",
+    )
+}
+
+
+def warm_up(this_year: Optional[int] = None, leave_days: Iterable[int] = range(0, 41)) -> None:
+    """Import NumPy and pandas and fill the calendar and period caches ahead of requests"""
+
+    import pandas  # noqa: F401
+
+    from src.tax import DEFAULT_TAX_SCHEDULE, get_compiled_tax_schedules
+
+    this_year = resolve_year(this_year)
+    DEFAULT_TAX_SCHEDULE.calculate_tax_array([0.0])
+    get_compiled_tax_schedules().calculate_tax([0.0], this_year)
+    utils.get_number_of_weekdays(f"{this_year}-01-01", f"{this_year}-12-31")
+    for year in (this_year - 1, this_year, this_year + 1):
+        for days in leave_days:
+            get_period_schedule(year, days)
+
+
+def _to_json(value: Any) -> Any:
+    # NumPy scalars and arrays
+    if hasattr(value, "tolist"):
+        return value.tolist()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _call(function: Callable, args: Any) -> Any:
+    return function(*args) if isinstance(args, list) else function(**args)
+
+
+def handle_request(request: dict) -> dict:
+    """Answer one request of the form {"id", "type", "args"} or {"id", "type", "batch"}.
+
+    ``args`` is a list of positional or a dict of keyword arguments, and ``batch`` a list of
+    such arguments answered with a list of results. Errors are returned rather than raised.
+    """
+
+    response = {"id": request.get("id")}
+    try:
+        function = SERVICE_FUNCTIONS.get(request.get("type"))
+        if function is None:
+            raise ValueError(f"Unknown request type: {request.get('type')}")
+
+        if "batch" in request:
+            response["result"] = [_call(function, args) for args in request["batch"]]
+        else:
+            response["result"] = _call(function, request.get("args", {}))
+    except Exception as error:
+        response["error"] = {"type": type(error).__name__, "message": str(error)}
+
+    return response
+
+
+def _error_line(error: ValueError) -> str:
+    # Lines that are not a request at all, reported as a ValueError without an id
+    return json.dumps({"id": None, "error": {"type": "ValueError", "message": str(error)}})
+
+
+def handle_line(line: str) -> str:
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("A request must be a JSON object")
+    except ValueError as error:
+        return _error_line(error)
+
+    return json.dumps(handle_request(request), default=_to_json)
+
+
+def serve_stream(reader: IO[str], writer: IO[str]) -> None:
+    """Answer JSON-lines requests from reader on writer until reader is exhausted"""
+
+    for line in reader:
+        if line.strip():
+            writer.write(handle_line(line) + "\n")
+            writer.flush()
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if line.strip():
+                try:
+                    response = handle_line(line.decode())
+                except UnicodeDecodeError as error:
+                    response = _error_line(error)
+
+                self.wfile.write(response.encode() + b"\n")
+                self.wfile.flush()
+
+
+def _remove_socket(path: str) -> None:
+    """Remove a stale socket at path, refusing to delete anything else"""
+
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"Not a socket, refusing to replace: {path}")
+
+    os.unlink(path)
+
+
+class IncomeServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """JSON-lines income queries over a Unix socket, one thread per connection"""
+
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        _remove_socket(path)
+        self.path = path
+        super().__init__(path, _LineHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        _remove_socket(self.path)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Long-running income query service")
+    parser.add_argument("--socket", help="serve on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--year", type=int, help="year to warm the caches for")
+    args = parser.parse_args(argv)
+
+    warm_up(args.year)
+    if args.socket is None:
+        serve_stream(sys.stdin, sys.stdout)
+        return
+
+    with IncomeServer(args.socket) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import concurrent.futures
+from multiprocessing import shared_memory
+from typing import Optional, Union
+
+import numpy as np
+
+from src.account_store import FLOAT_COLUMNS, AccountStore
+
+DAILY_HOURS_RANGE = (8, 10)
+MAX_RAISE = 0.05
+PAY_THRESHOLD_HOURS = 40
+
+# Get a raise with probability p, (1-p)^261 = 0.4 -> p = 0.0035
+RAISE_PROBABILITY = 0.0035
+
+SIMULATED_COLUMNS = FLOAT_COLUMNS[:-1]
+
+# Accounts sharing one random stream, chunks of work are made of whole blocks
+STREAM_BLOCK_SIZE = 4096
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+
+def spawn_block_seeds(seed: Seed, n_accounts: int, block_size: int = STREAM_BLOCK_SIZE) -> list:
+    """Spawn one independent SeedSequence per block of block_size accounts from a top-level seed.
+
+    The block seeds depend only on the seed and the block number, so any split of the blocks
+    across workers draws exactly the same numbers. Pass a SeedSequence (e.g. one built from a
+    previous run's ``entropy``) to reproduce an unseeded run.
+    """
+
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return root.spawn(-(-n_accounts // block_size))
+
+
+class RandomStreams:
+    """Independent random generators for consecutive blocks of accounts.
+
+    Every draw covers all the accounts and takes each block's numbers from that block's own
+    generator, so results do not depend on how the population is chunked.
+    """
+
+    def __init__(self, seeds: list, n_accounts: int, block_size: int = STREAM_BLOCK_SIZE):
+        if len(seeds) != -(-n_accounts // block_size):
+            raise ValueError("Need exactly one seed per block of accounts")
+
+        self.generators = [np.random.default_rng(seed) for seed in seeds]
+        self.n_accounts = n_accounts
+        self.block_size = block_size
+        self._starts = list(range(0, n_accounts, block_size))
+        self._sizes = [min(block_size, n_accounts - start) for start in self._starts]
+
+    def _concatenate(self, draws: list) -> np.ndarray:
+        return np.concatenate(draws) if draws else np.empty(0)
+
+    def uniform(self, low: float, high: float) -> np.ndarray:
+        return self._concatenate(
+            [
+                generator.uniform(low, high, size)
+                for generator, size in zip(self.generators, self._sizes)
+            ]
+        )
+
+    def random(self) -> np.ndarray:
+        return self._concatenate(
+            [generator.random(size) for generator, size in zip(self.generators, self._sizes)]
+        )
+
+    def uniform_at(self, mask: np.ndarray, low: float, high: float) -> np.ndarray:
+        """Draw one number per selected account, from the selected account's block"""
+
+        if not self.n_accounts:
+            return np.empty(0)
+
+        counts = np.add.reduceat(mask.astype(np.int64), self._starts).tolist()
+        return self._concatenate(
+            [
+                generator.uniform(low, high, count)
+                for generator, count in zip(self.generators, counts)
+            ]
+        )
+
+
+def simulate_daily_events(store: AccountStore, streams: RandomStreams) -> np.ndarray:
+    """Advance every account in the store by one day, returns the mask of accounts raised"""
+
+    # Add hours for the day
+    store.add_hours(np.round(streams.uniform(*DAILY_HOURS_RANGE), 2))
+
+    # Give raises
+    raised = streams.random() < RAISE_PROBABILITY
+    increases = 1 + streams.uniform_at(raised, 0, MAX_RAISE)
+    if raised.any():
+        store.update_rate(np.round(store.rate[raised] * increases, 2), index=raised)
+
+    # Pay accounts with more than 40 hours
+    payable = store.unpaid_hours >= PAY_THRESHOLD_HOURS
+    if payable.any():
+        store.pay(index=payable)
+
+    return raised
+
+
+def simulate_n_days(
+    store: AccountStore, n: int, seed: Seed = None, block_size: int = STREAM_BLOCK_SIZE
+) -> AccountStore:
+    """Advance every account in the store by n days"""
+
+    seeds = spawn_block_seeds(seed, len(store), block_size)
+    streams = RandomStreams(seeds, len(store), block_size)
+    for _ in range(n):
+        simulate_daily_events(store, streams)
+
+    return store
+
+
+def _attach_shared_columns(names: dict, n_accounts: int) -> tuple:
+    blocks = {}
+    columns = {}
+    for column, name in names.items():
+        blocks[column] = shared_memory.SharedMemory(name=name)
+        columns[column] = np.ndarray(n_accounts, np.float64, buffer=blocks[column].buf)
+
+    return blocks, columns
+
+
+def _simulate_chunk(
+    names: dict, n_accounts: int, start: int, stop: int, n: int, seeds: list, block_size: int
+) -> tuple:
+    """Simulate rows start:stop of the shared columns in place, returns the raises given"""
+
+    blocks, columns = _attach_shared_columns(names, n_accounts)
+    try:
+        rows = np.arange(start, stop)
+        chunk_columns: dict = {column: values[start:stop] for column, values in columns.items()}
+        chunk = AccountStore(
+            rows,
+            np.full(len(rows), ""),
+            np.full(len(rows), ""),
+            chunk_columns.pop("rate"),
+            copy=False,
+            **chunk_columns,
+        )
+
+        streams = RandomStreams(seeds, len(rows), block_size)
+        raised_rows, raised_rates = [], []
+        for _ in range(n):
+            raised = simulate_daily_events(chunk, streams)
+            raised_rows.append(rows[raised])
+            raised_rates.append(chunk.rate[raised])
+
+        del chunk, columns
+        return np.concatenate(raised_rows), np.concatenate(raised_rates)
+    finally:
+        for block in blocks.values():
+            block.close()
+
+
+def simulate_n_days_parallel(
+    store: AccountStore,
+    n: int,
+    workers: Optional[int] = None,
+    chunk_size: int = 65_536,
+    seed: Seed = None,
+    block_size: int = STREAM_BLOCK_SIZE,
+) -> AccountStore:
+    """Advance every account in the store by n days across a pool of worker processes.
+
+    The simulated columns are placed in shared memory and every worker mutates its contiguous
+    chunk of accounts in place, so only the chunk bounds, the block seeds and the (rare) raises
+    cross process boundaries. Chunk sizes are rounded up to whole random-stream blocks, which
+    makes the result identical to ``simulate_n_days`` with the same seed for any worker count
+    or chunk size.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    # Workers mutate the shared columns directly, bypassing the journal
+    if store.journal is not None:
+        raise ValueError("Journaled stores are simulated with simulate_n_days")
+
+    n_accounts = len(store)
+    blocks_per_chunk = -(-chunk_size // block_size)
+    seeds = spawn_block_seeds(seed, n_accounts, block_size)
+    chunks = [
+        (
+            first_block * block_size,
+            min((first_block + blocks_per_chunk) * block_size, n_accounts),
+            seeds[first_block : first_block + blocks_per_chunk],
+        )
+        for first_block in range(0, len(seeds), blocks_per_chunk)
+    ]
+
+    blocks = {}
+    try:
+        for column in SIMULATED_COLUMNS:
+            values = getattr(store, column)
+            blocks[column] = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(n_accounts, np.float64, buffer=blocks[column].buf)[:] = values
+
+        names = {column: block.name for column, block in blocks.items()}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _simulate_chunk, names, n_accounts, start, stop, n, chunk_seeds, block_size
+                )
+                for start, stop, chunk_seeds in chunks
+            ]
+            raises = [future.result() for future in futures]
+
+        for column, block in blocks.items():
+            getattr(store, column)[:] = np.ndarray(n_accounts, np.float64, buffer=block.buf)
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    for raised_rows, raised_rates in raises:
+        store.rate_history.append(raised_rows, raised_rates)
+
+    store.recompute()
+
+    return store
@@ -0,0 +1,201 @@
+import functools
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SUPER_RATE = 0.105
+
+
+class TaxSchedule:
+    """Progressive tax schedule described by a table of brackets.
+
+    Bracket ``i`` applies to incomes in ``(thresholds[i], thresholds[i + 1]]`` and taxes them as
+    ``base_amounts[i] + (income - thresholds[i]) * rates[i]``. A flat ``medicare_levy`` rate is
+    added on the whole income and ``super_rate`` is the employer super contribution rate.
+    """
+
+    def __init__(
+        self,
+        thresholds: Sequence[float],
+        rates: Sequence[float],
+        base_amounts: Sequence[float],
+        medicare_levy: float = 0.0,
+        super_rate: float = SUPER_RATE,
+    ):
+        if not len(thresholds) == len(rates) == len(base_amounts):
+            raise ValueError("Thresholds, rates and base amounts must have the same length")
+
+        if list(thresholds) != sorted(thresholds):
+            raise ValueError("Thresholds must be sorted")
+
+        self.thresholds = tuple(thresholds)
+        self.rates = tuple(rates)
+        self.base_amounts = tuple(base_amounts)
+        self.medicare_levy = medicare_levy
+        self.super_rate = super_rate
+
+        # Upper bounds used for the bracket search, an income equal to a bound stays below it
+        self._upper_bounds = self.thresholds[1:]
+
+    def __repr__(self) -> str:
+        return f"TaxSchedule({self.thresholds}, {self.rates}, {self.base_amounts})"
+
+    def calculate_tax(self, income: float) -> float:
+        i = bisect_left(self._upper_bounds, income)
+        tax = self.base_amounts[i] + (income - self.thresholds[i]) * self.rates[i]
+        return tax + income * self.medicare_levy if self.medicare_levy else tax
+
+    @functools.cached_property
+    def _arrays(self) -> tuple:
+        # Built on first use so that scalar-only callers never import NumPy
+        import numpy as np
+
+        thresholds = np.asarray(self.thresholds, dtype=np.float64)
+        rates = np.asarray(self.rates, dtype=np.float64)
+        base_amounts = np.asarray(self.base_amounts, dtype=np.float64)
+        return thresholds, rates, base_amounts, thresholds[1:]
+
+    def calculate_tax_array(self, incomes: Any) -> "np.ndarray":
+        import numpy as np
+
+        thresholds, rates, base_amounts, upper_bounds = self._arrays
+        incomes = np.asarray(incomes, dtype=np.float64)
+        i = np.searchsorted(upper_bounds, incomes, side="left")
+        taxes = base_amounts[i] + (incomes - thresholds[i]) * rates[i]
+        return taxes + incomes * self.medicare_levy if self.medicare_levy else taxes
+
+    @functools.cached_property
+    def _take_home_bounds(self) -> "np.ndarray":
+        _, _, _, upper_bounds = self._arrays
+        return upper_bounds - self.calculate_tax_array(upper_bounds)
+
+    def income_for_take_home(self, take_homes: Any) -> "np.ndarray":
+        """Invert income - tax in closed form for an array of take-home amounts.
+
+        Take-home pay is linear within each bracket, so the bracket is found by searching the
+        take-home at the bracket bounds and the income solved from that bracket's line.
+        """
+
+        import numpy as np
+
+        thresholds, rates, base_amounts, _ = self._arrays
+        if np.any(rates + self.medicare_levy >= 1):
+            raise ValueError("Take-home pay must grow with income to be inverted")
+
+        take_homes = np.asarray(take_homes, dtype=np.float64)
+        i = np.searchsorted(self._take_home_bounds, take_homes, side="left")
+        return (take_homes + base_amounts[i] - thresholds[i] * rates[i]) / (
+            1 - rates[i] - self.medicare_levy
+        )
+
+
+DEFAULT_TAX_SCHEDULE = TaxSchedule(
+    thresholds=(0, 18200, 45000, 120000, 180000),
+    rates=(0, 0.19, 0.325, 0.37, 0.45),
+    base_amounts=(0, 0, 5092, 29467, 51667),
+)
+
+# Resident rates from 1 July 2024 with the 2% Medicare levy, not registered by default so that
+# results stay those of DEFAULT_TAX_SCHEDULE unless a caller opts in with register_tax_schedule
+STAGE_THREE_TAX_SCHEDULE = TaxSchedule(
+    thresholds=(0, 18200, 45000, 135000, 190000),
+    rates=(0, 0.16, 0.30, 0.37, 0.45),
+    base_amounts=(0, 0, 4288, 31288, 51638),
+    medicare_levy=0.02,
+    super_rate=0.115,
+)
+
+# Year -> schedule applying from that year until the next registered one, years before the
+# first registered one use DEFAULT_TAX_SCHEDULE
+TAX_SCHEDULES: dict = {}
+
+
+def register_tax_schedule(year: int, schedule: TaxSchedule) -> TaxSchedule:
+    TAX_SCHEDULES[year] = schedule
+    get_compiled_tax_schedules.cache_clear()
+
+    return schedule
+
+
+def get_tax_schedule(year: Optional[int] = None) -> TaxSchedule:
+    """The schedule in force in a year, DEFAULT_TAX_SCHEDULE when no year is given"""
+
+    years = sorted(TAX_SCHEDULES)
+    i = bisect_right(years, year) if year is not None else 0
+    return TAX_SCHEDULES[years[i - 1]] if i else DEFAULT_TAX_SCHEDULE
+
+
+class CompiledTaxSchedules:
+    """Every registered schedule stacked into lookup arrays for mixed-year batches.
+
+    Row 0 is the default schedule and row ``k`` the ``k``-th registered year. Brackets are
+    padded with infinite thresholds so that all schedules share one shape, and a batch of
+    (income, year) pairs is taxed with one bracket search whatever the years.
+    """
+
+    def __init__(self, schedules: dict, default: TaxSchedule = DEFAULT_TAX_SCHEDULE):
+        import numpy as np
+
+        self.years = np.array(sorted(schedules), dtype=np.int64)
+        rows = [default] + [schedules[year] for year in self.years.tolist()]
+        width = max(len(schedule.thresholds) for schedule in rows)
+
+        def table(column: str, padding: float) -> np.ndarray:
+            return np.array(
+                [
+                    list(getattr(schedule, column)) + [padding] * (width - len(schedule.thresholds))
+                    for schedule in rows
+                ],
+                np.float64,
+            )
+
+        self.thresholds = table("thresholds", np.inf)
+        self.rates = table("rates", 0.0)
+        self.base_amounts = table("base_amounts", 0.0)
+        self.medicare_levies = np.array([schedule.medicare_levy for schedule in rows])
+        self.super_rates = np.array([schedule.super_rate for schedule in rows])
+
+    def rows(self, years: Any) -> "np.ndarray":
+        import numpy as np
+
+        return np.searchsorted(self.years, np.asarray(years, dtype=np.int64), side="right")
+
+    def calculate_tax(self, incomes: Any, years: Any) -> "np.ndarray":
+        import numpy as np
+
+        incomes = np.asarray(incomes, dtype=np.float64)
+        rows = np.broadcast_to(self.rows(years), incomes.shape)
+
+        # Bracket = number of upper bounds strictly below the income, as in searchsorted "left"
+        i = (self.thresholds[rows, 1:] < incomes[..., None]).sum(axis=-1)
+        taxes = (
+            self.base_amounts[rows, i] + (incomes - self.thresholds[rows, i]) * self.rates[rows, i]
+        )
+        return taxes + incomes * self.medicare_levies[rows]
+
+    def super_rate(self, years: Any) -> "np.ndarray":
+        return self.super_rates[self.rows(years)]
+
+
+@functools.lru_cache(maxsize=None)
+def get_compiled_tax_schedules() -> CompiledTaxSchedules:
+    return CompiledTaxSchedules(TAX_SCHEDULES)
+
+
+def calculate_tax(income: float, year: Optional[int] = None) -> float:
+    return get_tax_schedule(year).calculate_tax(income)
+
+
+def calculate_tax_array(incomes: Any, years: Any = None) -> "np.ndarray":
+    """Calculate tax for an array (or pandas Series) of incomes in one pass.
+
+    ``years`` (a year or an array broadcasting against the incomes) picks each income's
+    schedule, all incomes use DEFAULT_TAX_SCHEDULE without it.
+    """
+
+    if years is None:
+        return DEFAULT_TAX_SCHEDULE.calculate_tax_array(incomes)
+
+    return get_compiled_tax_schedules().calculate_tax(incomes, years)
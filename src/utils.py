@@ -1,27 +1,24 @@
-import concurrent.futures
+from operator import add, mul, sub, truediv
+from typing import Any, Optional
 
-import numpy as np
-import pandas as pd
+from src.instrumentation import instrumented
+from src.periods import (
+    DEFAULT_PERIODS,
+    INCOME_FIELDS,
+    PERIOD_REGISTRY,
+    get_period_schedule,
+    resolve_year,
+)
+from src.tax import calculate_tax, calculate_tax_array, get_tax_schedule  # noqa: F401
 
-
-def calculate_tax(income: float) -> float:
-    if income <= 18200:
-        return 0
-    elif income <= 45000:
-        return (income - 18200) * 0.19
-    elif income <= 120000:
-        return (income - 45000) * 0.325 + 5092
-    elif income <= 180000:
-        return (income - 120000) * 0.37 + 29467
-    else:
-        return (income - 180000) * 0.45 + 51667
+DICT_OPERATORS = {"+": add, "-": sub, "*": mul, "/": truediv}
 
 
+@instrumented
 def get_number_of_weekdays(start_date: str, end_date: str) -> int:
-    start_date = pd.to_datetime(start_date)
-    end_date = pd.to_datetime(end_date)
-    weekdays = pd.date_range(start_date, end_date, freq="B")
-    return len(weekdays)
+    from src.business_days import get_default_calendar
+
+    return int(get_default_calendar().count(start_date, end_date))
 
 
 def get_number_of_weekdays_minus_leave(start_date: str, end_date: str, leave_days: int) -> int:
@@ -29,28 +26,28 @@ def get_number_of_weekdays_minus_leave(start_date: str, end_date: str, leave_day
 
 
 def get_number_of_hours_in_year_minus_leave(year: int, leave_days: int = 0) -> int:
-    return get_number_of_weekdays_minus_leave(f"{year}-01-01", f"{year}-12-31", leave_days) * 8
+    return get_period_schedule(year, leave_days).divisors["hours"]
 
 
 def get_number_of_weekdays_in_year_minus_leave(year: int, leave_days: int = 0) -> int:
-    return get_number_of_weekdays(f"{year}-01-01", f"{year}-12-31") - leave_days
+    return get_period_schedule(year, leave_days).weekdays
 
 
 def get_number_of_weeks_in_year_minus_leave(year: int, leave_days: int = 0) -> float:
-    return round(get_number_of_weekdays_in_year_minus_leave(year, leave_days) / 5, 0)
+    return get_period_schedule(year, leave_days).divisors["weeks"]
 
 
 def get_number_of_biweeks_in_year_minus_leave(year: int, leave_days: int = 0) -> float:
-    return round(get_number_of_weekdays_in_year_minus_leave(year, leave_days) / 10, 0)
+    return get_period_schedule(year, leave_days).divisors["biweeks"]
 
 
 def get_number_of_months_in_year_minus_leave(year: int, leave_days: int = 0) -> float:
-    return round(get_number_of_weekdays_in_year_minus_leave(year, leave_days) / 22, 0)
+    return get_period_schedule(year, leave_days).divisors["months"]
 
 
 # Convert daily income to yearly income
 def get_yearly_income_using_daily_income(
-    daily_income: float, leave_days: int, this_year: pd.Timestamp
+    daily_income: float, leave_days: int, this_year: int
 ) -> float:
     return daily_income * get_number_of_weekdays_in_year_minus_leave(this_year, leave_days)
 
@@ -68,21 +65,24 @@ def change_dict_keys_to_new_string(dictionary: dict, string: str) -> dict:
     return {k.replace("yearly", string): v for k, v in dictionary.items()}
 
 
+@instrumented
 def create_yearly_income_dict(
     daily_rate: float,
     daily_hours: float,
     leave_days: int,
-    this_year: pd.Timestamp = pd.to_datetime("today").year,
+    this_year: Optional[int] = None,
 ) -> dict:
+    this_year = resolve_year(this_year)
+    schedule = get_tax_schedule(this_year)
     income_dict = {}
     yearly_income = get_yearly_income_using_daily_income(
         daily_hours * daily_rate, leave_days, this_year
     )
 
     income_dict["yearly_income"] = yearly_income
-    income_dict["yearly_tax"] = calculate_tax(yearly_income)
+    income_dict["yearly_tax"] = schedule.calculate_tax(yearly_income)
     income_dict["yearly_take_home"] = yearly_income - income_dict["yearly_tax"]
-    income_dict["yearly_super"] = yearly_income * 0.105
+    income_dict["yearly_super"] = yearly_income * schedule.super_rate
     income_dict["yearly_take_home_plus_super"] = (
         income_dict["yearly_take_home"] + income_dict["yearly_super"]
     )
@@ -96,59 +96,49 @@ def create_yearly_income_dict(
 
 
 def x_to_name(x: str) -> str:
-    if x == "hours":
-        return "hourly"
-    elif x == "weekdays":
-        return "daily"
-    elif x == "weeks":
-        return "weekly"
-    elif x == "months":
-        return "monthly"
-    elif x == "biweeks":
-        return "biweekly"
-    elif x == "year":
-        return "yearly"
-    return x
+    return PERIOD_REGISTRY[x].label if x in PERIOD_REGISTRY else x
 
 
+@instrumented
 def create_x_income_dict(
     daily_rate: float,
     daily_hours: float,
     leave_days: int,
     x: str,
-    this_year: pd.Timestamp = pd.to_datetime("today").year,
+    this_year: Optional[int] = None,
 ) -> dict:
+    this_year = resolve_year(this_year)
     income_dict = create_yearly_income_dict(daily_rate, daily_hours, leave_days, this_year)
 
     if x == "year":
         return income_dict
-    return change_dict_keys_to_new_string(
-        divide_dict_by_x(
-            income_dict,
-            eval(f"get_number_of_{x}_in_year_minus_leave(this_year, leave_days)"),
-        ),
-        x_to_name(x),
-    )
+    return get_period_schedule(this_year, leave_days).view(income_dict, x)
 
 
+@instrumented
 def create_all_x_income_dicts(
     daily_rate: float,
     daily_hours: float,
     leave_days: int,
-    this_year: pd.Timestamp = pd.to_datetime("today").year,
+    this_year: Optional[int] = None,
 ) -> dict:
+    this_year = resolve_year(this_year)
+    income_dict = create_yearly_income_dict(daily_rate, daily_hours, leave_days, this_year)
+    schedule = get_period_schedule(this_year, leave_days)
+
     return {
-        x: create_x_income_dict(daily_rate, daily_hours, leave_days, x, this_year)
-        for x in ["year", "months", "biweeks", "weeks", "weekdays", "hours"]
+        x: income_dict if x == "year" else schedule.view(income_dict, x) for x in DEFAULT_PERIODS
     }
 
 
+@instrumented
 def create_all_x_income_dicts_for_multiple_rates(
     daily_rates: list,
     daily_hours: float,
     leave_days: int,
-    this_year: pd.Timestamp = pd.to_datetime("today").year,
+    this_year: Optional[int] = None,
 ) -> dict:
+    this_year = resolve_year(this_year)
     return {
         f"{daily_rate}": create_all_x_income_dicts(daily_rate, daily_hours, leave_days, this_year)
         for daily_rate in daily_rates
@@ -159,9 +149,11 @@ def dicts_have_matching_keys(d1: dict, d2: dict) -> bool:
     return d1.keys() == d2.keys()
 
 
+@instrumented
 def operate_dicts(d1: dict, d2: dict, operator: str) -> dict:
-    if dicts_have_matching_keys(d1, d2) and operator in ["+", "-", "*", "/"]:
-        return {k: eval(f"{d1[k]} {operator} {d2[k]}") for k in d1.keys()}
+    if dicts_have_matching_keys(d1, d2) and operator in DICT_OPERATORS:
+        operation = DICT_OPERATORS[operator]
+        return {k: operation(d1[k], d2[k]) for k in d1.keys()}
     else:
         return {k: d1[k] for k in d1.keys()}
 
@@ -174,61 +166,47 @@ def process_rate(
     period: str,
     base_rate_dict: dict,
 ) -> tuple:
-    rate_dict = create_all_x_income_dicts(rate, daily_hours, leave_days, this_year)[period]
+    rate_dict = create_x_income_dict(rate, daily_hours, leave_days, period, this_year)
     return (rate, operate_dicts(rate_dict, base_rate_dict, "-"))
 
 
 # Compare list of rates to a base rate
+@instrumented
 def compare_rates_to_base_rate(
     base_rate: float,
     period: str,
-    rates: np.arange,
+    rates: Any,
     daily_hours: float,
     leave_days: int,
-    this_year: pd.Timestamp = pd.to_datetime("today").year,
+    this_year: Optional[int] = None,
 ) -> dict:
-    base_rate_dict = create_all_x_income_dicts(base_rate, daily_hours, leave_days, this_year)[
-        period
-    ]
-    rates = sorted(np.insert(rates, 0, base_rate))
-    compare_dict = {}
-
-    with concurrent.futures.ProcessPoolExecutor(max_workers=None) as executor:
-        futures = [
-            executor.submit(
-                process_rate,
-                rate,
-                daily_hours,
-                leave_days,
-                this_year,
-                period,
-                base_rate_dict,
-            )
-            for rate in rates
-        ]
-        compare_dict = {f.result()[0]: f.result()[1] for f in futures}
-
-    return compare_dict
+    import numpy as np
 
+    from src.income import compare_rates
 
+    this_year = resolve_year(this_year)
+    rates = np.sort(np.insert(rates, 0, base_rate))
+    compare = compare_rates(base_rate, rates, daily_hours, leave_days, this_year, [period])
+
+    keys = [f"{x_to_name(period)}_{field}" for field in INCOME_FIELDS] + ["rate"]
+    rows = zip(*(compare[column].tolist() for column in [*INCOME_FIELDS, "rate_difference"]))
+
+    return {rate: {**dict(zip(keys, row)), "hours": 0.0} for rate, row in zip(rates.tolist(), rows)}
+
+
+@instrumented
 def get_excel_sheet_of_compare_rates_to_base_rate(
     base_rate: float,
     periods: list,
-    rates: np.arange,
+    rates: Any,
     daily_hours: float,
     leave_days: int,
-    this_year: pd.Timestamp = pd.to_datetime("today").year,
+    this_year: Optional[int] = None,
+    path: str = "compare_rates.xlsx",
 ) -> None:
-    with pd.ExcelWriter("compare_rates.xlsx") as writer:
-        for period in periods:
-            pd.DataFrame.from_dict(
-                compare_rates_to_base_rate(
-                    base_rate,
-                    period,
-                    rates,
-                    daily_hours,
-                    leave_days,
-                    this_year,
-                ),
-                orient="index",
-            ).round(2).to_excel(writer, sheet_name=period)
+    from src.export import export_compare_rates
+
+    this_year = resolve_year(this_year)
+    export_compare_rates(
+        path, base_rate, periods, rates, daily_hours, leave_days, this_year, format="xlsx"
+    )
@@ -0,0 +1,180 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.account_store import AccountStore, AccountView
+from src.accounts import Account
+
+
+@pytest.fixture
+def store() -> AccountStore:
+    return AccountStore(
+        [1_000_000_001, 1_000_000_002, 1_000_000_003],
+        ["John", "X", "Jane"],
+        ["Doe", "Y", "Roe"],
+        [10.0, 60, 25.5],
+    )
+
+
+def test_bulk_sequence_matches_accounts(store: AccountStore) -> None:
+    accounts = store.to_accounts()
+    for account in accounts:
+        account.add_hours(40)
+        account.pay(20)
+        account.update_rate(account.rate + 10)
+        account.add_hours(10)
+        account.pay()
+
+    store.add_hours(40)
+    store.pay(20)
+    store.update_rate(store.rate + 10)
+    store.add_hours(10)
+    paid = store.pay()
+
+    assert paid["paid_income"].tolist() == [account.paid_income for account in accounts]
+    assert paid["paid_hours"].tolist() == [50, 50, 50]
+    assert store.average_rate()["average_rate"].tolist() == [
+        account.average_rate()["average_rate"] for account in accounts
+    ]
+    assert [len(store.pay_raise(row)) for row in range(len(store))] == [2, 2, 2]
+
+
+def test_bulk_operations_respect_index_masks(store: AccountStore) -> None:
+    mask = np.array([True, False, True])
+    store.add_hours(np.array([8.0, 9.5]), index=mask)
+    store.pay(index=np.flatnonzero(mask)[:1])
+
+    assert store.unpaid_hours.tolist() == [0.0, 0.0, 9.5]
+    assert store.paid_hours.tolist() == [8.0, 0.0, 0.0]
+    assert store.get_income(index=mask)["unpaid_income"].tolist() == [0.0, 242.25]
+
+    with pytest.raises(ValueError):
+        store.average_rate(index=mask)
+
+
+def test_account_view_uses_store(store: AccountStore) -> None:
+    view = store[1]
+    assert isinstance(view, AccountView)
+    assert view == Account(1_000_000_002, "X", "Y", 60)
+    assert view.add_hours(40) == {"unpaid_hours": 40.0, "paid_hours": 0.0}
+    assert view.pay(20)["paid_income"] == 1200.0
+    assert view.update_rate(70) == {"rate": 70.0}
+
+    assert store.paid_income[1] == 1200.0
+    assert store.rate[1] == 70.0
+    assert [rate for rate, _ in view.pay_raise] == [60.0, 70.0]
+
+
+def test_missing_rate_raises() -> None:
+    store = AccountStore([1_000_000_001], ["John"], ["Doe"], [None])
+    assert store[0].rate is None
+    with pytest.raises(ValueError):
+        store.add_hours(8)
+
+
+def test_save_and_load_round_trip(store: AccountStore, tmp_path: Path) -> None:
+    store.add_hours(40)
+    store.pay(20)
+    store.update_rate([11.0, 61.5], index=[0, 1])
+
+    path = str(tmp_path / "population" / "accounts.npz")
+    store.save(path)
+    loaded = AccountStore.load(path)
+
+    assert [loaded.get_info(row) for row in range(len(loaded))] == [
+        store.get_info(row) for row in range(len(store))
+    ]
+    assert loaded.pay_raise(0) == store.pay_raise(0)
+    assert len(loaded.pay_raise(1)) == 2
+
+
+def test_from_data_path_concatenates_batches(
+    store: AccountStore, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    store.add_hours(8)
+    store.pay()
+    for account in store:
+        account.save()
+
+    loaded = AccountStore.from_data_path("data", batch_size=2, executor=None)
+    assert sorted(loaded.id.tolist()) == sorted(store.id.tolist())
+    assert sorted(loaded.paid_income.tolist()) == sorted(store.paid_income.tolist())
+    assert len(loaded.rate_history) == len(store)
+
+
+def test_generate_fills_store_directly() -> None:
+    store = AccountStore.generate(2500, seed=3, batch_size=1000)
+    other = AccountStore.generate(2500, seed=3, batch_size=1000)
+
+    assert len(store) == 2500
+    assert (store.id == other.id).all()
+    assert (store.first_name == other.first_name).all()
+    assert 29 < store.rate.mean() < 31
+    assert (store.paid_income == 0).all()
+
+
+def test_aggregates_follow_bulk_operations(store: AccountStore) -> None:
+    assert store.aggregates()["average_pay_rate"] is None
+
+    store.add_hours(40)
+    store.pay(10, index=[0, 2])
+    store.update_rate(30.0, index=[1])
+    store[0].unpaid_hours = 5
+    aggregates = store.aggregates()
+
+    expected = {
+        "accounts": 3,
+        "rated_accounts": 3,
+        "total_unpaid_hours": store.unpaid_hours.sum(),
+        "total_unpaid_income": store.unpaid_income.sum(),
+        "total_paid_hours": 20.0,
+        "total_paid_income": 355.0,
+        "average_rate": 65.5 / 3,
+        "average_pay_rate": 17.75,
+    }
+    assert aggregates == pytest.approx(expected)
+    store.recompute()
+    assert store.aggregates() == pytest.approx(aggregates)
+
+
+def test_aggregates_skip_unset_rates() -> None:
+    store = AccountStore([1_000_000_001, 1_000_000_002], ["A", "B"], ["C", "D"], [None, 20.0])
+
+    assert store.aggregates()["rated_accounts"] == 1
+    assert store.aggregates()["average_rate"] == 20.0
+
+
+def test_to_accounts_splits_history_once(
+    store: AccountStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store.update_rate([11.0, 61.0], index=[0, 1])
+    expected = [store.pay_raise(row) for row in range(len(store))]
+
+    # A per-row search of the history makes the conversion quadratic in the accounts
+    def for_row(row: int) -> tuple:
+        raise AssertionError("to_accounts searched the history per row")
+
+    monkeypatch.setattr(store.rate_history, "for_row", for_row)
+    assert [account.pay_raise for account in store.to_accounts()] == expected
+
+
+def test_aggregates_count_repeated_rows_once(store: AccountStore) -> None:
+    store.add_hours(5, index=[0, 0])
+    store.update_rate([20.0, 30.0], index=[1, 1])
+    store.pay(index=np.array([0, 0]))
+    aggregates = store.aggregates()
+
+    store.recompute()
+    assert aggregates == pytest.approx(store.aggregates())
+    assert aggregates["total_paid_hours"] == 5
+
+
+def test_view_setters_keep_longer_names(store: AccountStore) -> None:
+    view = store[1]
+    view.first_name = "Alexander"
+    view.last_name = "Montgomery-Smith"
+
+    assert (view.first_name, view.last_name) == ("Alexander", "Montgomery-Smith")
+    assert store.first_name.tolist() == ["John", "Alexander", "Jane"]
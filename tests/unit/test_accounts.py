@@ -1,6 +1,20 @@
+from pathlib import Path
+from typing import Optional
+from unittest.mock import ANY
+
+import numpy as np
 import pytest
 
-from src.accounts import Account
+from src.account_store import AccountStore
+from src.accounts import (
+    Account,
+    create_account_from_json,
+    create_accounts_from_data_path,
+    generate_accounts,
+    get_name_sampler,
+    iter_account_batches_from_data_path,
+    iter_generated_accounts,
+)
 
 
 @pytest.mark.parametrize(
@@ -75,3 +89,92 @@ def test_sequence_of_daily_accounting_events(
     account.update_rate(rate + 10)
     account.add_hours(10)
     assert account.pay() == expected["second"]
+
+
+def test_account_save_writes_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    account = Account(1_000_000_001, "John", "Doe", 10.0)
+    account.add_hours(8)
+    account.pay()
+    account.save()
+
+    loaded = create_account_from_json(f"data/{account.id}.json")
+    assert loaded.get_info() == account.get_info()
+
+
+@pytest.fixture
+def data_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    for i in range(1, 26):
+        account = Account(1_000_000_000 + i, "John", "Doe", 10.0 + i)
+        account.add_hours(i)
+        account.pay()
+        account.save()
+
+    return tmp_path / "data"
+
+
+@pytest.mark.parametrize(
+    "executor, batch_size",
+    [
+        (None, 7),
+        ("thread", 4),
+        ("process", 10),
+    ],
+)
+def test_iter_account_batches_from_data_path(
+    data_path: Path, executor: Optional[str], batch_size: int
+) -> None:
+    batches = list(
+        iter_account_batches_from_data_path(
+            str(data_path), batch_size=batch_size, executor=executor
+        )
+    )
+
+    assert all(0 < len(batch) <= batch_size for batch in batches)
+    assert sorted(account.id for batch in batches for account in batch) == [
+        1_000_000_000 + i for i in range(1, 26)
+    ]
+
+
+def test_create_accounts_from_data_path(data_path: Path) -> None:
+    accounts = create_accounts_from_data_path(str(data_path), executor="thread")
+    assert {account.id: account.paid_income for account in accounts} == {
+        1_000_000_000 + i: i * (10.0 + i) for i in range(1, 26)
+    }
+
+
+def test_iter_account_batches_rejects_unknown_executor(data_path: Path) -> None:
+    with pytest.raises(ValueError):
+        next(iter_account_batches_from_data_path(str(data_path), executor="gpu"))
+
+
+def test_name_sampler_follows_name_frequencies() -> None:
+    rng = np.random.default_rng(0)
+    last_names = get_name_sampler().last_names(100_000, rng)
+    first_names = get_name_sampler().first_names(1000, rng)
+
+    assert 0.009 < np.mean(last_names == "Smith") < 0.013
+    assert all(name == "" or name[0].isupper() for name in first_names)
+
+
+def test_generate_accounts_is_reproducible() -> None:
+    accounts = generate_accounts(50, seed=5)
+
+    assert [repr(account) for account in accounts] == [
+        repr(account) for account in generate_accounts(50, seed=5)
+    ]
+    assert all(account.id > 1_000_000_000 for account in accounts)
+    assert all(account.pay_raise == [[account.rate, ANY]] for account in accounts)
+
+
+def test_iter_generated_accounts_is_lazy() -> None:
+    generated = iter_generated_accounts(10**12, batch_size=3, seed=5)
+    assert len([next(generated) for _ in range(4)]) == 4
+
+
+def test_data_path_loader_skips_a_saved_store(data_path: Path) -> None:
+    AccountStore.generate(3, seed=1).save()
+
+    assert (data_path / "accounts.npz").exists()
+    assert len(create_accounts_from_data_path(str(data_path), executor=None)) == 25
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.business_days import BusinessDayCalendar, get_default_calendar
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        ("2020-01-01", "2020-01-31"),
+        ("2020-01-04", "2020-01-05"),
+        ("2020-01-06", "2020-01-06"),
+        ("2045-01-01", "2100-06-30"),
+        ("1850-01-01", "1950-12-31"),
+        ("2199-06-01", "2201-03-31"),
+    ],
+)
+def test_count_matches_pandas_business_days(start_date: str, end_date: str) -> None:
+    expected = len(pd.date_range(start_date, end_date, freq="B"))
+    assert get_default_calendar().count(start_date, end_date) == expected
+
+
+def test_count_is_zero_when_end_is_before_start() -> None:
+    assert get_default_calendar().count("2020-01-31", "2020-01-01") == 0
+
+
+def test_count_accepts_vectors_of_dates() -> None:
+    starts = np.array(["2020-01-01", "2020-02-01", "2020-03-01"], dtype="datetime64[D]")
+    ends = np.array(["2020-01-31", "2020-02-29", "2020-03-31"], dtype="datetime64[D]")
+    assert get_default_calendar().count(starts, ends).tolist() == [23, 20, 22]
+
+
+def test_count_skips_holidays() -> None:
+    calendar = BusinessDayCalendar(
+        "2020-01-01", "2020-12-31", holidays=["2020-01-01", "2020-01-27", "2020-01-26"]
+    )
+    assert calendar.count("2020-01-01", "2020-01-31") == 21
+
+
+@pytest.mark.parametrize(
+    "years, expected",
+    [
+        (2020, 262),
+        ([2020, 2021, 2022], [262, 261, 260]),
+    ],
+)
+def test_count_in_years(years: list, expected: list) -> None:
+    counts = get_default_calendar().count_in_years(years)
+    assert np.asarray(counts).tolist() == expected
+
+
+def test_calendar_rejects_reversed_span() -> None:
+    with pytest.raises(ValueError):
+        BusinessDayCalendar("2020-12-31", "2020-01-01")
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        ("20230101", "20231231"),
+        ("2023/01/01", "2023/12/31"),
+        ("Jan 1 2023", "Dec 31 2023"),
+        ("2023-01-01", "Dec 31 2023"),
+    ],
+)
+def test_count_parses_dates_like_pandas(start_date: str, end_date: str) -> None:
+    assert get_default_calendar().count(start_date, end_date) == 260
+
+
+def test_count_rejects_unparseable_dates() -> None:
+    with pytest.raises(ValueError):
+        get_default_calendar().count("not a date", "2023-12-31")
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        ("2023-01-01T10:00", "2023-01-10"),
+        ("2023-01-07 12:00", "2023-01-09 08:00"),
+        ("2023-01-02 10:00", "2023-01-02 10:00"),
+        ("2023-01-02 10:00", "2023-01-02 09:00"),
+        ("20230101 10:00", "2023-01-10 10:00"),
+        ("2023-01-02", "2023-01-09 08:00"),
+    ],
+)
+def test_count_with_times_of_day_matches_pandas(start_date: str, end_date: str) -> None:
+    expected = len(pd.date_range(start_date, end_date, freq="B"))
+    assert get_default_calendar().count(start_date, end_date) == expected
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.export as export
+import src.utils as utils
+
+RATES = np.arange(20, 40, 2.5)
+
+
+def test_excel_export_matches_per_period_comparison(tmp_path: Path) -> None:
+    path = str(tmp_path / "out" / "compare.xlsx")
+    utils.get_excel_sheet_of_compare_rates_to_base_rate(
+        30, ["year", "weeks", "hours"], RATES, 8, 6, 2021, path=path
+    )
+
+    sheets = pd.read_excel(path, sheet_name=None, index_col=0)
+    assert list(sheets) == ["year", "weeks", "hours"]
+    for period, sheet in sheets.items():
+        expected = pd.DataFrame.from_dict(
+            utils.compare_rates_to_base_rate(30, period, RATES, 8, 6, 2021), orient="index"
+        ).round(2)
+        pd.testing.assert_frame_equal(sheet, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_csv_export_is_independent_of_chunk_size(tmp_path: Path, chunk_size: int) -> None:
+    path = str(tmp_path / "compare.csv")
+    export.export_compare_rates(
+        path, 30, ["year", "weeks"], RATES, 8, 6, 2021, chunk_size=chunk_size
+    )
+
+    table = pd.read_csv(path)
+    assert list(table.columns) == ["period", *export.COMPARE_COLUMNS]
+    assert len(table) == 2 * len(RATES)
+    assert table.groupby("period")["rate"].apply(list).to_dict() == {
+        "weeks": RATES.tolist(),
+        "year": RATES.tolist(),
+    }
+
+
+def test_export_rejects_unknown_format(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        export.export_compare_rates(str(tmp_path / "compare.txt"), 30, ["year"], RATES, 8, 6, 2021)
@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+
+import src.income as income
+import src.tax as tax
+import src.utils as utils
+from src.periods import DEFAULT_PERIODS, INCOME_FIELDS, get_period_schedule
+
+
+@pytest.mark.parametrize(
+    "daily_rates, daily_hours, leave_days",
+    [
+        ([27, 30, 35], 8, 6),
+        ([75.69, 100, 42], 11.43, 20),
+    ],
+)
+def test_create_yearly_income_records_matches_income_dict(
+    daily_rates: list, daily_hours: float, leave_days: int
+) -> None:
+    records = income.create_yearly_income_records(daily_rates, daily_hours, leave_days, 2021)
+    assert records.to_dicts() == [
+        utils.create_yearly_income_dict(daily_rate, daily_hours, leave_days, 2021)
+        for daily_rate in daily_rates
+    ]
+
+
+def test_income_records_arithmetic() -> None:
+    records = income.create_yearly_income_records([27, 30, 35], 8, 6, 2021)
+    base = income.create_yearly_income_records(30, 8, 6, 2021)
+
+    differences = records - base
+    assert differences["income"].tolist() == [-6120.0, 0.0, 10200.0]
+    assert differences["rate"].tolist() == [-3.0, 0.0, 5.0]
+    assert differences["hours"].tolist() == [0.0, 0.0, 0.0]
+    assert (differences + base)[1] == base
+    assert (records * 2 / 2) == records
+    assert (records[::2] - records[::2])["tax"].tolist() == [0.0, 0.0]
+
+
+def test_income_records_per_period_matches_income_dicts() -> None:
+    records = income.create_yearly_income_records([27, 30, 35], 8, 6, 2021)
+    schedule = get_period_schedule(2021, 6)
+
+    for period in DEFAULT_PERIODS:
+        label = utils.x_to_name(period)
+        assert records.per_period(schedule, period).to_dicts(label) == [
+            utils.create_all_x_income_dicts(rate, 8, 6, 2021)[period] for rate in [27, 30, 35]
+        ]
+
+
+def test_compare_rates_is_tidy() -> None:
+    rates = np.arange(25, 35)
+    compare = income.compare_rates(30, rates, 8, 5, 2021)
+
+    assert len(compare) == len(rates) * len(DEFAULT_PERIODS)
+    assert list(compare.columns) == ["period", "rate", *INCOME_FIELDS, "rate_difference"]
+    assert (compare.loc[compare["rate"] == 30, list(INCOME_FIELDS)] == 0).all().all()
+
+
+@pytest.mark.parametrize("period", DEFAULT_PERIODS)
+def test_compare_rates_matches_income_dicts(period: str) -> None:
+    base_rate, rates = 43.56, np.array([31.0, 50.5, 120.25])
+    compare = income.compare_rates(base_rate, rates, 8, 18, 2021, [period])
+
+    base = utils.create_all_x_income_dicts(base_rate, 8, 18, 2021)[period]
+    for rate, row in zip(rates, compare.itertuples(index=False)):
+        expected = utils.create_all_x_income_dicts(rate, 8, 18, 2021)[period]
+        name = utils.x_to_name(period)
+        for field in INCOME_FIELDS:
+            key = f"{name}_{field}"
+            assert getattr(row, field) == pytest.approx(expected[key] - base[key])
+
+
+def test_project_income_matches_income_dicts_per_year() -> None:
+    projection = income.project_income([30, 42.5], 8, 6, [2020, 2021, 2022])
+
+    assert len(projection) == len(DEFAULT_PERIODS) * 3 * 2
+    for row in projection.itertuples(index=False):
+        expected = utils.create_x_income_dict(row.rate, 8, 6, row.period, row.year)
+        label = utils.x_to_name(row.period)
+        assert row.daily_rate == row.rate
+        assert [getattr(row, field) for field in INCOME_FIELDS] == [
+            expected[f"{label}_{field}"] for field in INCOME_FIELDS
+        ]
+
+
+@pytest.mark.parametrize(
+    "escalation, expected",
+    [
+        (0.1, [30.0, 33.0, 36.3]),
+        ([0.0, 0.05, 0.1], [30.0, 31.5, 34.65]),
+        ([0.5, 0.0, 0.0], [45.0, 45.0, 45.0]),
+    ],
+)
+def test_project_income_escalates_rates(escalation: object, expected: list) -> None:
+    projection = income.project_income(30, 8, 0, [2021, 2022, 2023], escalation, ["year"])
+
+    np.testing.assert_allclose(projection["daily_rate"], expected)
+    np.testing.assert_allclose(
+        projection["income"], projection["daily_rate"] * 8 * np.array([261, 260, 260])
+    )
+
+
+def test_project_income_rejects_mismatched_escalation() -> None:
+    with pytest.raises(ValueError):
+        income.project_income(30, 8, 0, [2021, 2022], [0.1, 0.1, 0.1])
+
+
+@pytest.mark.parametrize("period", ["year", "weeks", "hours"])
+def test_solve_daily_rates_inverts_income_dicts(period: str) -> None:
+    rates = np.array([0.5, 30, 75.25, 120, 400])
+    leave_days = np.array([0, 6, 20, 6, 0])
+    label = utils.x_to_name(period)
+    take_homes = [
+        utils.create_x_income_dict(rate, 8, days, period, 2021)[f"{label}_take_home"]
+        for rate, days in zip(rates, leave_days)
+    ]
+
+    solved = income.solve_daily_rates(take_homes, 8, leave_days, 2021, period)
+    np.testing.assert_allclose(solved["rate"], rates)
+    np.testing.assert_allclose(
+        solved["take_home"],
+        [
+            utils.create_yearly_income_dict(rate, 8, days, 2021)["yearly_take_home"]
+            for rate, days in zip(rates, leave_days)
+        ],
+    )
+
+
+@pytest.mark.parametrize("take_home", [-10.0, 0.0, 18200.0, 39908.0, 90533.0, 128333.0, 500000.0])
+def test_income_for_take_home_at_bracket_bounds(take_home: float) -> None:
+    schedule = tax.DEFAULT_TAX_SCHEDULE
+    income_ = schedule.income_for_take_home(take_home)
+    assert income_ - schedule.calculate_tax(income_) == pytest.approx(take_home)
@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import src.instrumentation as instrumentation
+import src.utils as utils
+from src.account_store import AccountStore
+from src.accounts import (
+    create_accounts_from_data_path,
+    generate_accounts,
+    generate_n_days_events_for_accounts,
+)
+
+
+@pytest.fixture
+def enabled() -> Iterator[None]:
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        yield
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+
+def test_disabled_instrumentation_records_nothing() -> None:
+    instrumentation.reset()
+    utils.create_all_x_income_dicts(30, 8, 6, 2021)
+
+    assert instrumentation.stats() == {}
+
+
+def test_instrumented_calls_are_counted(enabled: None) -> None:
+    utils.create_all_x_income_dicts(30, 8, 6, 2021)
+    utils.create_all_x_income_dicts(35, 8, 6, 2021)
+
+    stats = instrumentation.stats()
+    assert stats["create_all_x_income_dicts"]["calls"] == 2
+    assert stats["create_yearly_income_dict"]["calls"] == 2
+    assert stats["create_all_x_income_dicts"]["wall_seconds"] > 0
+
+
+def test_generators_and_bytes_are_counted(
+    enabled: None, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    accounts = generate_n_days_events_for_accounts(generate_accounts(3, seed=1), 5, seed=1)
+    for account in accounts:
+        account.save()
+    create_accounts_from_data_path("data", executor=None)
+
+    stats = instrumentation.stats()
+    assert stats["Account.save"]["calls"] == 3
+    assert stats["Account.save"]["bytes"] == sum(
+        path.stat().st_size for path in (tmp_path / "data").iterdir()
+    )
+    assert stats["iter_account_batches_from_data_path"]["calls"] == 1
+    assert stats["create_accounts_from_json_files"]["calls"] == 1
+
+
+def test_prometheus_export(enabled: None) -> None:
+    utils.operate_dicts({"a": 1}, {"a": 2}, "+")
+    text = instrumentation.to_prometheus()
+
+    assert "# TYPE finances_calls_total counter" in text
+    assert 'finances_calls_total{function="operate_dicts"} 1' in text
+    assert '"operate_dicts": {"calls": 1' in instrumentation.to_json()
+
+
+def test_store_save_counts_the_file_numpy_writes(enabled: None, tmp_path: Path) -> None:
+    store = AccountStore.generate(10, seed=1)
+    store.save(str(tmp_path / "population"))
+
+    written = tmp_path / "population.npz"
+    assert instrumentation.stats()["AccountStore.save"]["bytes"] == written.stat().st_size
+    assert len(AccountStore.load(str(written))) == 10
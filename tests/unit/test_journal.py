@@ -0,0 +1,98 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.account_store import AccountStore
+from src.journal import JOURNAL_DTYPE, Journal, read_journal, restore
+from src.rate_history import now_us
+from src.simulation import simulate_n_days, simulate_n_days_parallel
+
+COLUMNS = ("rate", "unpaid_hours", "unpaid_income", "paid_hours", "paid_income")
+
+
+def assert_same_state(store: AccountStore, expected: AccountStore) -> None:
+    for column in COLUMNS:
+        np.testing.assert_array_equal(getattr(store, column), getattr(expected, column))
+
+
+def test_journal_records_resolved_mutations(tmp_path: Path) -> None:
+    store = AccountStore([1_000_000_001, 1_000_000_002], ["A", "B"], ["C", "D"], [10.0, 20.0])
+    with Journal(str(tmp_path)) as journal:
+        journal.attach(store)
+        store.add_hours(np.array([8.0, 9.0]))
+        store.pay(index=[1])
+        store.update_rate(12.5, index=[0])
+
+    records = read_journal(str(tmp_path))
+    assert records["seq"].tolist() == [0, 1, 2, 3]
+    assert records["kind"].tolist() == [0, 0, 1, 2]
+    assert records["row"].tolist() == [0, 1, 1, 0]
+    assert records["value"].tolist() == [8.0, 9.0, 9.0, 12.5]
+
+
+def test_restore_replays_simulation_from_snapshot(tmp_path: Path) -> None:
+    store = AccountStore.generate(500, seed=1)
+    with Journal(str(tmp_path)) as journal:
+        journal.attach(store)
+        simulate_n_days(store, 30, seed=2)
+        time.sleep(0.001)
+        middle = now_us()
+        snapshot = AccountStore.load(journal.snapshot(store))
+        time.sleep(0.001)
+        simulate_n_days(store, 30, seed=3)
+
+    assert_same_state(restore(str(tmp_path)), store)
+    assert_same_state(restore(str(tmp_path), until=middle), snapshot)
+    assert len(restore(str(tmp_path)).rate_history) == len(store.rate_history)
+
+
+def test_restore_matches_live_store_after_rate_changes_and_repeated_rows(
+    tmp_path: Path,
+) -> None:
+    store = AccountStore([1_000_000_001, 1_000_000_002], ["A", "B"], ["C", "D"], [10.0, 20.0])
+    with Journal(str(tmp_path)) as journal:
+        journal.attach(store)
+        store.add_hours(5, index=[0])
+        store.update_rate(50.0, index=[0])
+        store.add_hours(np.array([3.0, 3.0]), index=[1, 1])
+        store.add_hours(2, index=[1])
+        store.pay(np.array([1.0, 2.0]), index=[1, 1])
+        store.update_rate(30.0, index=[1])
+        store.get_income(index=[1])
+
+    assert store.unpaid_income.tolist() == [50.0, 90.0]
+    assert_same_state(restore(str(tmp_path)), store)
+
+
+def test_parallel_simulation_rejects_journaled_store(tmp_path: Path) -> None:
+    store = AccountStore.generate(10, seed=1)
+    with Journal(str(tmp_path)) as journal:
+        journal.attach(store)
+        with pytest.raises(ValueError):
+            simulate_n_days_parallel(store, 1)
+
+
+def test_restore_needs_a_snapshot(tmp_path: Path) -> None:
+    Journal(str(tmp_path)).close()
+    with pytest.raises(ValueError):
+        restore(str(tmp_path))
+
+
+def test_reopening_drops_a_partly_written_record(tmp_path: Path) -> None:
+    store = AccountStore.generate(50, seed=1)
+    with Journal(str(tmp_path)) as journal:
+        journal.attach(store)
+        simulate_n_days(store, 5, seed=2)
+
+    # A crash in the middle of a write
+    with open(tmp_path / "journal.bin", "ab") as f:
+        f.write(b"\x01" * 7)
+
+    with Journal(str(tmp_path)) as journal:
+        assert (tmp_path / "journal.bin").stat().st_size == journal.seq * JOURNAL_DTYPE.itemsize
+        store.journal = journal
+        simulate_n_days(store, 5, seed=3)
+
+    assert_same_state(restore(str(tmp_path)), store)
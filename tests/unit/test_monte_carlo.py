@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import src.monte_carlo as monte_carlo
+
+
+def test_running_stats_merge_matches_numpy() -> None:
+    values = np.random.default_rng(0).normal(100, 15, 10_001)
+    left = monte_carlo.RunningStats().update(values[:3_000]).update(values[3_000:7_000])
+    right = monte_carlo.RunningStats().update(values[7_000:])
+    stats = left.merge(right)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_quantile_sketch_is_small_and_accurate() -> None:
+    values = np.random.default_rng(1).uniform(0, 1, 200_000)
+    sketches = [monte_carlo.QuantileSketch(200, seed=part) for part in range(4)]
+    for sketch, part in zip(sketches, np.array_split(values, 4)):
+        for batch in np.array_split(part, 50):
+            sketch.update(batch)
+
+    sketch = sketches[0].merge(sketches[1]).merge(sketches[2].merge(sketches[3]))
+    assert sketch.count == len(values)
+    assert sketch.retained < 2_000
+    np.testing.assert_allclose(sketch.quantile([0.05, 0.5, 0.95]), [0.05, 0.5, 0.95], atol=0.02)
+
+
+def test_empty_sketch_quantile_is_nan() -> None:
+    assert np.isnan(monte_carlo.QuantileSketch().quantile(0.5))
+
+
+def test_replications_do_not_depend_on_batching() -> None:
+    root = np.random.SeedSequence(5)
+    together = monte_carlo.simulate_replications(50, 20, range(4), root, 2021)
+    apart = [monte_carlo.simulate_replications(50, 20, [r], root, 2021) for r in range(4)]
+
+    for metric in monte_carlo.MONTE_CARLO_METRICS:
+        np.testing.assert_array_equal(together[metric], [result[metric][0] for result in apart])
+    assert (together["total_cost"] > together["wages"]).all()
+
+
+def test_worker_summaries_merge_into_whole_run() -> None:
+    whole = monte_carlo.run_monte_carlo(20, 10, 12, batch_size=5, seed=3, this_year=2021)
+    first = monte_carlo.run_monte_carlo(20, 10, 7, batch_size=3, seed=3, this_year=2021)
+    rest = monte_carlo.run_monte_carlo(20, 10, 5, batch_size=5, seed=3, start=7, this_year=2021)
+    merged = first.merge(rest)
+
+    assert merged.replications == whole.replications == 12
+    for metric in monte_carlo.MONTE_CARLO_METRICS:
+        assert merged.stats[metric].to_dict() == pytest.approx(whole.stats[metric].to_dict())
+    assert set(whole.to_dict()["wages"]["quantiles"]) == {0.05, 0.5, 0.95}
+
+
+def test_seeded_runs_give_the_same_quantiles() -> None:
+    # Small sketches so that compaction (the sketch's only randomness) kicks in
+    runs = [
+        monte_carlo.run_monte_carlo(5, 3, 40, batch_size=8, seed=5, this_year=2021, k=4)
+        for _ in range(2)
+    ]
+
+    assert runs[0].to_dict() == runs[1].to_dict()
@@ -0,0 +1,50 @@
+import pytest
+
+import src.periods as periods
+import src.utils as utils
+
+
+@pytest.mark.parametrize(
+    "this_year, leave_days, expected",
+    [
+        (2021, 0, {"year": 1, "months": 12.0, "biweeks": 26.0, "weeks": 52.0, "weekdays": 261}),
+        (2021, 20, {"year": 1, "months": 11.0, "biweeks": 24.0, "weeks": 48.0, "weekdays": 241}),
+        (2020, 6, {"year": 1, "months": 12.0, "biweeks": 26.0, "weeks": 51.0, "weekdays": 256}),
+    ],
+)
+def test_period_schedule_divisors(this_year: int, leave_days: int, expected: dict) -> None:
+    schedule = periods.PeriodSchedule(this_year, leave_days)
+    assert {period: schedule.divisors[period] for period in expected} == expected
+    assert schedule.divisors["hours"] == expected["weekdays"] * 8
+
+
+def test_period_schedule_view_renames_and_divides() -> None:
+    yearly = utils.create_yearly_income_dict(30, 8, 6, 2021)
+    view = periods.get_period_schedule(2021, 6).view(yearly, "weeks")
+
+    assert list(view) == [f"weekly_{field}" for field in periods.INCOME_FIELDS] + ["rate", "hours"]
+    assert view["weekly_income"] == 1200.0
+    assert view["rate"] == 30.0
+
+
+def test_register_period_adds_user_defined_period() -> None:
+    periods.register_period("semesters", "semesterly", lambda weekdays: 2)
+    try:
+        yearly = utils.create_yearly_income_dict(30, 8, 0, 2021)
+        assert utils.create_x_income_dict(30, 8, 0, "semesters", 2021) == {
+            **{
+                key.replace("yearly", "semesterly"): value / 2
+                for key, value in yearly.items()
+                if key.startswith("yearly")
+            },
+            "rate": 30.0,
+            "hours": 8.0,
+        }
+    finally:
+        del periods.PERIOD_REGISTRY["semesters"]
+        periods.get_period_schedule.cache_clear()
+
+
+def test_period_schedule_rejects_unknown_periods() -> None:
+    with pytest.raises(ValueError):
+        periods.PeriodSchedule(2021, 0, ["decades"])
@@ -0,0 +1,91 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import src.rate_history as rate_history
+
+
+def test_append_grows_past_capacity() -> None:
+    history = rate_history.RateHistory(capacity=2)
+    for row in range(5):
+        history.append(row, 10.0 + row, times=row)
+
+    assert len(history) == 5
+    assert history.rows.tolist() == [0, 1, 2, 3, 4]
+    assert history.rates.tolist() == [10.0, 11.0, 12.0, 13.0, 14.0]
+    assert history.times.tolist() == [0, 1, 2, 3, 4]
+
+
+def test_for_row_returns_entries_in_time_order() -> None:
+    history = rate_history.RateHistory.from_arrays(
+        [1, 0, 1, 1], [30, 10, 10, 20], [3.0, 9.0, 1.0, 2.0]
+    )
+
+    times, rates = history.for_row(1)
+    assert times.tolist() == [10, 20, 30]
+    assert rates.tolist() == [1.0, 2.0, 3.0]
+    assert history.for_row(2)[0].tolist() == []
+
+
+@pytest.mark.parametrize(
+    "rows, times, expected",
+    [
+        (0, 5, [np.nan]),
+        (0, 10, [1.0]),
+        (0, 19, [1.0]),
+        (0, 25, [2.0]),
+        (1, 15, [np.nan]),
+        (1, 100, [5.0]),
+        ([0, 1, 0, 2], [30, 20, 5, 50], [2.0, 5.0, np.nan, np.nan]),
+    ],
+)
+def test_rate_at(rows: object, times: object, expected: list) -> None:
+    history = rate_history.RateHistory.from_arrays([0, 1, 0], [10, 20, 20], [1.0, 5.0, 2.0])
+
+    np.testing.assert_array_equal(np.atleast_1d(history.rate_at(rows, times)), expected)
+
+
+def test_rate_at_empty_history_is_nan() -> None:
+    assert np.isnan(rate_history.RateHistory().rate_at([0, 1], 10)).all()
+
+
+def test_timestamps_round_trip_through_strings() -> None:
+    moment = datetime.datetime(2021, 3, 4, 5, 6, 7, 891011).astimezone()
+    us = rate_history.to_epoch_us([str(moment)])[0]
+
+    assert rate_history.format_epoch_us(us) == str(moment)
+    assert rate_history.to_epoch_us([moment]).tolist() == [us]
+
+
+def test_for_row_sees_entries_appended_after_the_index() -> None:
+    history = rate_history.RateHistory.from_arrays([0, 1, 0], [10, 20, 30], [1.0, 5.0, 3.0])
+    history.for_row(0)
+    history.append([0, 1], [2.0, 6.0], times=[20, 40])
+
+    times, rates = history.for_row(0)
+    assert times.tolist() == [10, 20, 30]
+    assert rates.tolist() == [1.0, 2.0, 3.0]
+    assert history.for_row(1)[1].tolist() == [5.0, 6.0]
+
+
+def test_split_matches_for_row() -> None:
+    history = rate_history.RateHistory.from_arrays([2, 0, 2, 0], [30, 10, 10, 20], [1, 2, 3, 4])
+
+    times, rates = history.split(4)
+    assert len(times) == len(rates) == 4
+    for row in range(4):
+        assert times[row].tolist() == history.for_row(row)[0].tolist()
+        assert rates[row].tolist() == history.for_row(row)[1].tolist()
+
+
+def test_point_lookups_match_bulk_lookups() -> None:
+    rng = np.random.default_rng(0)
+    history = rate_history.RateHistory.from_arrays(
+        rng.integers(0, 50, 3000), rng.integers(0, 100, 3000), rng.random(3000)
+    )
+    history.rate_at(0, 0)
+    history.append(rng.integers(0, 50, 200), rng.random(200), times=rng.integers(0, 100, 200))
+
+    rows, times = rng.integers(0, 55, 200), rng.integers(-5, 105, 200)
+    np.testing.assert_array_equal(history.rate_at(rows, times), history._merge_rate_at(rows, times))
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from src.account_store import AccountStore
+from src.accounts import Account, generate_accounts
+from src.registry import AccountRegistry
+
+
+@pytest.fixture
+def registry() -> AccountRegistry:
+    return AccountRegistry(
+        [Account(1_000_000_000 + i, "John", "Doe", 10.0 + i) for i in range(1, 101)], seed=1
+    )
+
+
+def test_accounts_are_hashable(registry: AccountRegistry) -> None:
+    account = registry[1_000_000_005]
+    assert account in {account}
+    assert {account: 1}[Account(1_000_000_005, "X", "Y", 1)] == 1
+
+
+@pytest.mark.parametrize("mode", ["sequential", "random"])
+def test_allocate_ids_never_collides(registry: AccountRegistry, mode: str) -> None:
+    ids = np.concatenate([registry.allocate_ids(500, mode) for _ in range(4)])
+
+    assert len(np.unique(ids)) == len(ids) == 2000
+    assert not any(id in registry for id in ids.tolist())
+    assert (ids > 1_000_000_000).all()
+
+
+def test_add_rejects_duplicate_ids(registry: AccountRegistry) -> None:
+    with pytest.raises(ValueError):
+        registry.add(Account(1_000_000_001, "Jane", "Roe", 20.0))
+
+
+def test_create_allocates_next_sequential_id(registry: AccountRegistry) -> None:
+    account = registry.create("Jane", "Roe", 20.0)
+    assert account.id == 1_000_000_101
+    assert registry[account.id] is account
+
+
+def test_bulk_lookup_by_id_arrays(registry: AccountRegistry) -> None:
+    ids = np.array([1_000_000_050, 1_000_000_001, 1_000_000_100])
+    assert registry.rows(ids).tolist() == [49, 0, 99]
+    assert [account.rate for account in registry.get_many(ids)] == [60.0, 11.0, 110.0]
+
+    with pytest.raises(KeyError):
+        registry.rows([1_000_000_001, 5])
+
+
+def test_store_backed_registry_indexes_rows() -> None:
+    store = AccountStore(
+        [1_000_000_009, 1_000_000_003, 1_000_000_007], ["A"] * 3, ["B"] * 3, [1, 2, 3]
+    )
+    registry = AccountRegistry.from_store(store)
+
+    store.add_hours(8, index=registry.rows([1_000_000_007, 1_000_000_009]))
+    assert store.unpaid_hours.tolist() == [8.0, 0.0, 8.0]
+    assert registry[1_000_000_003].rate == 2.0
+    assert registry.allocate_ids(3).tolist() == [1_000_000_001, 1_000_000_002, 1_000_000_004]
+
+    with pytest.raises(TypeError):
+        registry.add(Account(1_000_000_011, "A", "B", 1))
+
+
+def test_sequential_ids_skip_ids_taken_by_random_allocation(
+    registry: AccountRegistry, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class Drawn:
+        def integers(self, *args: object, **kwargs: object) -> np.ndarray:
+            return np.array([1_000_000_102, 1_000_000_104])
+
+        def permutation(self, ids: np.ndarray) -> np.ndarray:
+            return ids
+
+    monkeypatch.setattr(registry, "_rng", Drawn())
+    random_ids = registry.allocate_ids(2, "random")
+    registry.add(Account(int(random_ids[0]), "Jane", "Roe", 20.0))
+
+    assert registry.allocate_ids(3).tolist() == [1_000_000_101, 1_000_000_103, 1_000_000_105]
+
+
+def test_random_ids_leave_the_sequence_alone(registry: AccountRegistry) -> None:
+    registry.create("Jane", "Roe", 20.0, mode="random")
+
+    assert registry.create("Jane", "Roe", 20.0).id == 1_000_000_101
+
+
+def test_registering_foreign_ids_leaves_the_sequence_alone(registry: AccountRegistry) -> None:
+    for account in generate_accounts(3, seed=1):
+        registry.add(account)
+
+    assert registry.allocate_ids(1).tolist() == [1_000_000_101]
+
+
+def test_reindex_releases_reservations_the_new_store_holds() -> None:
+    store = AccountStore([1_000_000_001], ["A"], ["B"], [1])
+    registry = AccountRegistry.from_store(store, seed=1)
+    ids = registry.allocate_ids(2, "random")
+
+    grown = AccountStore.concat([store, AccountStore(ids, ["C", "D"], ["E", "F"], [2, 3])])
+    registry.reindex(grown)
+
+    assert registry._reserved == set()
+    assert registry.rows(ids).tolist() == [1, 2]
+    assert not set(registry.allocate_ids(5, "random").tolist()) & set(ids.tolist())
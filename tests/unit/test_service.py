@@ -0,0 +1,112 @@
+import io
+import json
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+import src.service as service
+import src.utils as utils
+
+
+@pytest.mark.parametrize(
+    "request_, expected",
+    [
+        ({"type": "calculate_tax", "args": [50000]}, utils.calculate_tax(50000)),
+        (
+            {
+                "type": "create_x_income_dict",
+                "args": {
+                    "daily_rate": 30,
+                    "daily_hours": 8,
+                    "leave_days": 6,
+                    "x": "weeks",
+                    "this_year": 2021,
+                },
+            },
+            utils.create_x_income_dict(30, 8, 6, "weeks", 2021),
+        ),
+        (
+            {"type": "calculate_tax", "batch": [[0], [50000], {"income": 200000}]},
+            [0, utils.calculate_tax(50000), utils.calculate_tax(200000)],
+        ),
+    ],
+)
+def test_handle_request_mirrors_utils(request_: dict, expected: object) -> None:
+    assert service.handle_request({"id": 7, **request_}) == {"id": 7, "result": expected}
+
+
+@pytest.mark.parametrize(
+    "line, error",
+    [
+        ('{"id": 1, "type": "eval", "args": []}', "ValueError"),
+        ('{"id": 1, "type": "calculate_tax", "args": {"salary": 1}}', "TypeError"),
+        ("not json", "ValueError"),
+    ],
+)
+def test_errors_are_returned(line: str, error: str) -> None:
+    response = json.loads(service.handle_line(line))
+    assert "result" not in response
+    assert response["error"]["type"] == error
+
+
+def test_serve_stream_answers_each_line() -> None:
+    requests = [
+        {
+            "id": 1,
+            "type": "compare_rates_to_base_rate",
+            "args": [30, "weeks", [25, 35], 8, 6, 2021],
+        },
+        {"id": 2, "type": "get_number_of_weekdays", "args": ["2021-01-01", "2021-12-31"]},
+    ]
+    writer = io.StringIO()
+    service.serve_stream(io.StringIO("\n".join(map(json.dumps, requests)) + "\n\n"), writer)
+
+    responses = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert [response["id"] for response in responses] == [1, 2]
+    assert list(responses[0]["result"]) == ["25", "30", "35"]
+    assert responses[1]["result"] == 261
+
+
+def test_unix_socket_server(tmp_path: Path) -> None:
+    path = str(tmp_path / "income.sock")
+    with service.IncomeServer(path) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with socket.socket(socket.AF_UNIX) as client:
+                client.connect(path)
+                client.sendall(b'{"id": "a", "type": "calculate_tax", "args": [50000]}\n')
+                response = json.loads(client.makefile().readline())
+        finally:
+            server.shutdown()
+
+    assert response == {"id": "a", "result": utils.calculate_tax(50000)}
+
+
+def test_unix_socket_server_answers_undecodable_lines(tmp_path: Path) -> None:
+    path = str(tmp_path / "income.sock")
+    with service.IncomeServer(path) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with socket.socket(socket.AF_UNIX) as client:
+                client.connect(path)
+                client.sendall(b"\xff\xfe\n" + b'{"id": 2, "type": "calculate_tax", "args": [0]}\n')
+                lines = client.makefile()
+                responses = [json.loads(lines.readline()) for _ in range(2)]
+        finally:
+            server.shutdown()
+
+    assert responses[0]["error"]["type"] == "ValueError"
+    assert responses[1] == {"id": 2, "result": 0}
+
+
+def test_server_refuses_to_replace_a_regular_file(tmp_path: Path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+
+    with pytest.raises(ValueError):
+        service.IncomeServer(str(path))
+    assert path.read_text() == "keep me"
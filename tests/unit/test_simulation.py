@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from src.account_store import AccountStore
+from src.accounts import Account, generate_n_days_events_for_accounts
+from src.simulation import (
+    PAY_THRESHOLD_HOURS,
+    RandomStreams,
+    simulate_daily_events,
+    simulate_n_days,
+    simulate_n_days_parallel,
+    spawn_block_seeds,
+)
+
+
+@pytest.fixture
+def store() -> AccountStore:
+    n = 1000
+    return AccountStore(
+        np.arange(n) + 1_000_000_001, ["John"] * n, ["Doe"] * n, np.linspace(20, 40, n)
+    )
+
+
+def test_simulate_daily_events_matches_account_rules(store: AccountStore) -> None:
+    streams = RandomStreams(spawn_block_seeds(7, len(store), 128), len(store), 128)
+    for _ in range(30):
+        before = store.paid_hours + store.unpaid_hours
+        rates = store.rate.copy()
+        raised = simulate_daily_events(store, streams)
+        worked = store.paid_hours + store.unpaid_hours - before
+
+        assert ((worked > 8 - 1e-9) & (worked < 10 + 1e-9)).all()
+        assert (store.unpaid_hours < PAY_THRESHOLD_HOURS).all()
+        assert (store.rate[~raised] == rates[~raised]).all()
+        assert (store.rate[raised] >= rates[raised]).all()
+
+
+def test_simulate_n_days_is_reproducible_with_a_seed(store: AccountStore) -> None:
+    other = AccountStore(store.id, store.first_name, store.last_name, store.rate.copy())
+    simulate_n_days(store, 261, seed=3)
+    simulate_n_days(other, 261, seed=3)
+
+    assert (store.paid_income == other.paid_income).all()
+    assert (store.rate == other.rate).all()
+    assert len(store.rate_history) > len(store)
+
+
+def test_generate_n_days_events_for_accounts_keeps_accounts() -> None:
+    accounts = [Account(1_000_000_000 + i, "John", "Doe", 30) for i in range(1, 11)]
+    results = generate_n_days_events_for_accounts(accounts, 20)
+
+    assert results == accounts
+    for account in results:
+        assert account.paid_hours + account.unpaid_hours >= 160
+        assert account.paid_income >= account.paid_hours * 30 - 1e-6
+        assert len(account.pay_raise) >= 1
+
+
+@pytest.mark.parametrize(
+    "workers, chunk_size",
+    [
+        (1, 1),
+        (2, 300),
+        (3, 5000),
+    ],
+)
+def test_simulate_n_days_parallel_matches_serial_streams(
+    store: AccountStore, workers: int, chunk_size: int
+) -> None:
+    serial = AccountStore(store.id, store.first_name, store.last_name, store.rate.copy())
+    simulate_n_days(serial, 20, seed=11, block_size=128)
+    simulate_n_days_parallel(store, 20, workers, chunk_size, seed=11, block_size=128)
+
+    assert (store.paid_income == serial.paid_income).all()
+    assert (store.unpaid_hours == serial.unpaid_hours).all()
+    assert (store.rate == serial.rate).all()
+    assert sorted(zip(store.rate_history.rows, store.rate_history.rates)) == sorted(
+        zip(serial.rate_history.rows, serial.rate_history.rates)
+    )
+
+
+def test_block_seeds_are_independent_of_population_size() -> None:
+    small = RandomStreams(spawn_block_seeds(5, 300, 128), 300, 128).random()
+    large = RandomStreams(spawn_block_seeds(5, 1000, 128), 1000, 128).random()
+
+    assert (small == large[:300]).all()
+    assert not (small[:128] == small[128:256]).any()
+
+
+def test_simulate_n_days_parallel_rejects_empty_chunks(store: AccountStore) -> None:
+    with pytest.raises(ValueError):
+        simulate_n_days_parallel(store, 1, chunk_size=0)
@@ -0,0 +1,88 @@
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.income as income
+import src.tax as tax
+import src.utils as utils
+
+
+@pytest.mark.parametrize(
+    "income, expected",
+    [
+        (0, 0),
+        (18200, 0),
+        (18201, 0.19),
+        (45000, 5092.0),
+        (120000, 29467.0),
+        (180000, 51667.0),
+        (200000, 60667.0),
+    ],
+)
+def test_calculate_tax_at_bracket_edges(income: float, expected: float) -> None:
+    assert tax.calculate_tax(income) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "incomes",
+    [
+        np.arange(0, 250_000, 250),
+        np.array([18200, 18200.01, 45000, 45000.5, 120000, 179999.99, 180000, 180000.01]),
+        pd.Series([87696, 208800, 208497.94469999996, 55080]),
+    ],
+)
+def test_calculate_tax_array_matches_scalar(incomes: np.ndarray) -> None:
+    expected = [tax.calculate_tax(income) for income in incomes]
+    assert tax.calculate_tax_array(incomes).tolist() == expected
+
+
+def test_tax_schedule_rejects_unsorted_thresholds() -> None:
+    with pytest.raises(ValueError):
+        tax.TaxSchedule(thresholds=(0, 100, 50), rates=(0, 0.1, 0.2), base_amounts=(0, 0, 5))
+
+
+@pytest.fixture
+def registered() -> Iterator[None]:
+    tax.register_tax_schedule(2025, tax.STAGE_THREE_TAX_SCHEDULE)
+    tax.register_tax_schedule(2030, tax.TaxSchedule((0, 50000), (0, 0.5), (0, 0), super_rate=0.12))
+    try:
+        yield
+    finally:
+        tax.TAX_SCHEDULES.clear()
+        tax.get_compiled_tax_schedules.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "year, expected",
+    [(None, 5092.0), (2021, 5092.0), (2025, 4288.0 + 900.0), (2029, 4288.0 + 900.0), (2031, 0.0)],
+)
+def test_tax_schedule_is_picked_by_year(registered: None, year: int, expected: float) -> None:
+    assert tax.calculate_tax(45000, year) == pytest.approx(expected)
+
+
+def test_compiled_schedules_match_scalar_per_year(registered: None) -> None:
+    incomes = np.arange(0, 250_000, 997.5)
+    years = np.resize([2020, 2025, 2027, 2030, 2040], len(incomes))
+
+    expected = [tax.calculate_tax(income, year) for income, year in zip(incomes, years.tolist())]
+    assert tax.calculate_tax_array(incomes, years).tolist() == expected
+    assert tax.get_compiled_tax_schedules().super_rate([2024, 2025, 2030]).tolist() == [
+        0.105,
+        0.115,
+        0.12,
+    ]
+
+
+def test_income_pipeline_uses_the_year_schedule(registered: None) -> None:
+    yearly = utils.create_yearly_income_dict(300, 8, 0, 2025)
+    projection = income.project_income(300, 8, 0, [2024, 2025], periods=["year"])
+
+    assert yearly["yearly_tax"] == tax.STAGE_THREE_TAX_SCHEDULE.calculate_tax(
+        yearly["yearly_income"]
+    )
+    assert yearly["yearly_super"] == yearly["yearly_income"] * 0.115
+    assert projection["tax"].tolist() == [
+        tax.calculate_tax(value, year) for value, year in zip(projection["income"], [2024, 2025])
+    ]
@@ -1,3 +1,7 @@
+import datetime
+import subprocess
+import sys
+
 import numpy as np
 import pytest
 
@@ -550,3 +554,33 @@ def test_compare_rates_to_base_rate(
         utils.compare_rates_to_base_rate(base_rate, period, rates, daily_hours, leave_days, 2021)
         == expected
     )
+
+
+@pytest.mark.parametrize(
+    "operator, expected",
+    [
+        ("+", {"a": 0.30000000000000004, "b": 5}),
+        ("-", {"a": -0.1, "b": 1}),
+        ("*", {"a": 0.020000000000000004, "b": 6}),
+        ("/", {"a": 0.5, "b": 1.5}),
+        ("%", {"a": 0.1, "b": 3}),
+    ],
+)
+def test_operate_dicts(operator: str, expected: dict) -> None:
+    assert utils.operate_dicts({"a": 0.1, "b": 3}, {"a": 0.2, "b": 2}, operator) == expected
+
+
+def test_income_dicts_do_not_import_pandas() -> None:
+    code = (
+        "import sys, src.utils as utils; utils.calculate_tax(50000); "
+        "assert 'numpy' not in sys.modules; utils.create_all_x_income_dicts(30, 8, 6); "
+        "assert 'pandas' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_default_year_is_resolved_at_call_time() -> None:
+    this_year = datetime.date.today().year
+    assert utils.create_yearly_income_dict(30, 8, 6) == utils.create_yearly_income_dict(
+        30, 8, 6, this_year
+    )